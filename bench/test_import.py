@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from time import perf_counter
+
+from multipledispatch import Dispatcher, dispatch
+
+
+def import_time(module="multipledispatch", repeat=5):
+    """Best cumulative import time of ``module`` in microseconds
+
+    Measured with ``python -X importtime`` in fresh interpreters.
+    """
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + module],
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stderr
+        for line in out.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _, cumulative, name = line.split("|")
+            if name.strip() == module:
+                times.append(int(cumulative))
+    return min(times)
+
+
+def imported_modules(module="multipledispatch"):
+    """Modules loaded by importing ``module`` in a fresh interpreter"""
+    code = (
+        "import sys; before = set(sys.modules); import %s; "
+        "print('\\n'.join(sorted(set(sys.modules) - before)))" % module
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+    return out.split()
+
+
+def test_import_time():
+    print("\nimport multipledispatch: %d us" % import_time())
+    assert "inspect" not in imported_modules()
+
+
+def test_decorate(n=1000):
+    start = perf_counter()
+    for i in range(n):
+        namespace = dict()
+
+        @dispatch(int, namespace=namespace)
+        def f(x):
+            return x
+
+        @dispatch(float, namespace=namespace)
+        def f(x):
+            return x
+
+        class Foo(object):
+            @dispatch(int, namespace=namespace)
+            def g(self, x):
+                return x
+
+            @dispatch(float, namespace=namespace)
+            def g(self, x):
+                return x
+
+        d = Dispatcher("d")
+
+        @d.register()
+        def h(x: int, y: float):
+            return x
+
+    elapsed = perf_counter() - start
+    print("\ndecorate 7 registrations: %d us" % (elapsed / n * 1e6))
@@ -0,0 +1,47 @@
+import gc
+import tracemalloc
+
+from multipledispatch import Dispatcher
+
+
+def churn(dispatcher, n):
+    """Call ``dispatcher`` on instances of ``n`` short lived classes"""
+    for i in range(n):
+        cls = type("Temporary%d" % i, (object,), {})
+        dispatcher(cls())
+
+
+def memory_growth(dispatcher, n=2000):
+    """Bytes still allocated after churning through ``n`` classes"""
+    churn(dispatcher, 100)  # warm up
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        churn(dispatcher, n)
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def make_dispatcher(**kwargs):
+    f = Dispatcher("f", **kwargs)
+    f.add((object,), lambda x: x)
+    f.add((int,), lambda x: x + 1)
+    return f
+
+
+def test_memory_class_churn():
+    strong = make_dispatcher()
+    weak = make_dispatcher(weak_cache=True)
+
+    strong_growth = memory_growth(strong)
+    weak_growth = memory_growth(weak)
+    print(
+        "\ncache growth over 2000 classes: strong %d bytes, weak %d bytes"
+        % (strong_growth, weak_growth)
+    )
+    assert len(weak._cache) == 0
+    assert len(strong._cache) == 2100
+    assert weak_growth < strong_growth / 10
@@ -1,4 +1,4 @@
-from .core import dispatch
+from .core import batch, dispatch, unregister
 from .dispatcher import (
     Dispatcher,
     halt_ordering,
@@ -0,0 +1,224 @@
+from collections import namedtuple
+from functools import partial
+from weakref import ref
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+class Cache(dict):
+    """Unbounded cache from input types to implementations
+
+    Lookups use the plain ``dict`` machinery.  The ``hits`` and ``misses``
+    counters are maintained by the dispatcher as it uses the cache, while
+    bounded caches count their own ``evictions``.
+
+    See Also:
+        make_cache
+    """
+
+    __slots__ = "hits", "misses", "evictions"
+
+    maxsize = None
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Cache statistics as a ``CacheInfo`` named tuple"""
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self)
+        )
+
+
+class LRUCache(Cache):
+    """Cache holding at most ``maxsize`` entries
+
+    The least recently used entry is evicted when a new entry would exceed
+    ``maxsize``.  Dictionaries keep insertion order, so recency is tracked
+    by moving an entry to the end whenever it is read.
+
+    >>> cache = LRUCache(2)
+    >>> cache["a"] = 1
+    >>> cache["b"] = 2
+    >>> cache["a"]
+    1
+    >>> cache["c"] = 3
+    >>> sorted(cache)
+    ['a', 'c']
+    >>> cache.evictions
+    1
+    """
+
+    __slots__ = ("maxsize",)
+
+    def __init__(self, maxsize):
+        Cache.__init__(self)
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = dict.pop(self, key)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        dict.pop(self, key, None)
+        dict.__setitem__(self, key, value)
+        while len(self) > self.maxsize:
+            self._evict(next(iter(dict.keys(self))))
+            self.evictions += 1
+
+    def _evict(self, key):
+        """Remove the entry of ``key``, as stored in the dictionary"""
+        dict.__delitem__(self, key)
+
+
+class NoCache(Cache):
+    """Cache that never stores anything"""
+
+    __slots__ = ()
+
+    maxsize = 0
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def weak_key(key):
+    """Weak references to a type or to each of a tuple of types"""
+    if isinstance(key, tuple):
+        return tuple(map(ref, key))
+    return ref(key)
+
+
+def strong_key(key):
+    """The types referred to by a key of ``weak_key``"""
+    if isinstance(key, tuple):
+        return tuple([r() for r in key])
+    return key()
+
+
+class WeakKeys(object):
+    """Mixin for caches holding their keys, types or tuples of types, weakly
+
+    Keys are stored as weak references, and entries are removed once one of
+    their types is garbage collected, as in ``weakref.WeakKeyDictionary``.
+    Dynamically created classes may thus be collected while cached.
+    Lookups create the weak references of their key, so they cost more.
+
+    Concrete classes provide a ``types`` slot, mapping weak references to
+    a callback reference and the keys of the type, see ``WeakCache``.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return super(WeakKeys, self).__getitem__(weak_key(key))
+
+    def __setitem__(self, key, value):
+        key = weak_key(key)
+        for r in key if isinstance(key, tuple) else (key,):
+            if r not in self.types:
+                self.types[r] = (ref(r(), partial(self._collect, r)), set())
+            self.types[r][1].add(key)
+        super(WeakKeys, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._discard(weak_key(key))
+
+    def __contains__(self, key):
+        return dict.__contains__(self, weak_key(key))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return [strong_key(key) for key in dict.keys(self)]
+
+    def items(self):
+        return [(strong_key(key), value) for key, value in dict.items(self)]
+
+    def clear(self):
+        dict.clear(self)
+        self.types.clear()
+
+    def _discard(self, key):
+        dict.__delitem__(self, key)
+        for r in key if isinstance(key, tuple) else (key,):
+            if r in self.types:
+                keys = self.types[r][1]
+                keys.discard(key)
+                if not keys:
+                    del self.types[r]
+
+    _evict = _discard
+
+    def _collect(self, r, _):
+        """Remove the entries of a type that has been garbage collected"""
+        _, keys = self.types.pop(r, (None, ()))
+        for key in keys:
+            if dict.__contains__(self, key):
+                self._discard(key)
+
+
+class WeakCache(WeakKeys, Cache):
+    """Unbounded cache holding its keys weakly, see ``WeakKeys``
+
+    >>> cache = WeakCache()
+    >>> class Temporary(object):
+    ...     pass
+    >>> cache[(Temporary, int)] = 1
+    >>> cache[(Temporary, int)]
+    1
+    >>> del Temporary
+    >>> import gc; _ = gc.collect()
+    >>> len(cache)
+    0
+    """
+
+    __slots__ = ("types",)
+
+    def __init__(self):
+        Cache.__init__(self)
+        self.types = {}
+
+
+class WeakLRUCache(WeakKeys, LRUCache):
+    """Cache holding at most ``maxsize`` entries and its keys weakly
+
+    See Also:
+        LRUCache
+        WeakKeys
+    """
+
+    __slots__ = ("types",)
+
+    def __init__(self, maxsize):
+        LRUCache.__init__(self, maxsize)
+        self.types = {}
+
+
+def make_cache(maxsize=None, weak=False):
+    """Create a resolution cache for a dispatcher
+
+    Parameters
+    ----------
+    maxsize : int or None
+        ``None`` for an unbounded cache, ``0`` to disable caching, or a
+        positive number of entries to keep in a least recently used cache.
+    weak : bool
+        Hold the types of cache keys weakly, see ``WeakKeys``.
+
+    >>> make_cache()
+    {}
+    >>> make_cache(128).maxsize
+    128
+    """
+    if maxsize is None:
+        return WeakCache() if weak else Cache()
+    if maxsize < 0:
+        raise ValueError("Cache size must be None or a non-negative integer")
+    if maxsize == 0:
+        return NoCache()
+    return WeakLRUCache(maxsize) if weak else LRUCache(maxsize)
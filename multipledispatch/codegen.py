@@ -0,0 +1,203 @@
+import builtins
+from functools import partial
+from keyword import iskeyword
+
+from .variadic import isvariadic, variadic_key
+
+#: Number of signatures per arity matched by type identity before the cache
+MAX_IDENTITY_CHECKS = 8
+
+_STALE = """
+def stale(*args, **kwargs):
+    return _recompile()(*args, **kwargs)
+"""
+
+
+def _stale_code():
+    ns = {}
+    exec(_STALE, ns)
+    return ns["stale"].__code__
+
+
+STALE_CODE = _stale_code()
+
+
+def function_name(name):
+    """A safe name for the generated function
+
+    >>> function_name('add')
+    'add'
+    >>> function_name('__init__')
+    'dispatched'
+    """
+    if (
+        isinstance(name, str)
+        and name.isidentifier()
+        and not iskeyword(name)
+        and not name.startswith("_")
+        and not hasattr(builtins, name)
+    ):
+        return name
+    return "dispatched"
+
+
+def generate(dispatcher, name):
+    """Source and globals of a function specialized to ``dispatcher``
+
+    Fixed arity signatures are first matched by type identity, up to
+    ``MAX_IDENTITY_CHECKS`` per arity, unless the dispatcher collects
+    statistics.  Other inputs go through the dispatcher's cache and, on a
+    miss, its usual resolution.  Results are checked for ``not_implemented``
+    if implementations may decline inputs by returning it.  If every
+    signature has the same fixed arity the function takes exactly that many
+    positional arguments, otherwise it takes ``*args`` and branches on their
+    number.
+    """
+    from .dispatcher import MDNotImplementedError
+
+    ns = {
+        "_cache": dispatcher._cache,
+        "_resolve": dispatcher._resolve,
+        "_fallback": dispatcher._fallback,
+        "_variadic_key": variadic_key,
+        "_MDNotImplementedError": MDNotImplementedError,
+        "_not_implemented": dispatcher._not_implemented,
+    }
+    names = {}
+
+    def ref(obj, prefix):
+        if (prefix, id(obj)) not in names:
+            names[prefix, id(obj)] = "_%s%d" % (prefix, len(names))
+            ns[names[prefix, id(obj)]] = obj
+        return names[prefix, id(obj)]
+
+    ordering = dispatcher.ordering
+    # Signatures with union types are ordered by the signatures they expand to
+    funcs, expanded = dispatcher.funcs, dispatcher._expanded
+    isfixed = [not (sig and isvariadic(sig[-1])) for sig in ordering]
+    arities = sorted(set(len(sig) for sig, fixed in zip(ordering, isfixed) if fixed))
+
+    def branch(n, indent):
+        pad = "    " * indent
+        params = ["a%d" % i for i in range(n)]
+        types = ["t%d" % i for i in range(n)]
+        key = "(%s)" % "".join(t + ", " for t in types) if n else "()"
+        if n == 1 and dispatcher._single:
+            # Match the keys of the single argument fast path of ``__call__``
+            key = "t0"
+        lines = ["%s%s = type(%s)" % (pad, t, p) for t, p in zip(types, params)]
+        exact = [
+            sig for sig, fixed in zip(ordering, isfixed) if fixed and len(sig) == n
+        ]
+        if dispatcher._stats is not None:
+            # Cached implementations count their calls
+            exact = []
+        conditional = "if"
+        for sig in exact[:MAX_IDENTITY_CHECKS] if n else []:
+            checks = ["%s is %s" % (t, ref(typ, "c")) for t, typ in zip(types, sig)]
+            lines.append("%s%s %s:" % (pad, conditional, " and ".join(checks)))
+            lines.append("%s    func = %s" % (pad, ref(funcs[expanded[sig]], "f")))
+            conditional = "elif"
+        if conditional == "elif":
+            lines.append("%selse:" % pad)
+            pad += "    "
+        lines += lookup(key, pad)
+        return lines
+
+    def lookup(key, pad, types=None):
+        if types is None:
+            types = "(t0,), t0" if key == "t0" else key
+        return [
+            "%stry:" % pad,
+            "%s    func = _cache[%s]" % (pad, key),
+            "%sexcept KeyError:" % pad,
+            "%s    func = _resolve(%s)" % (pad, types),
+        ]
+
+    variadic = not all(isfixed)
+    if not variadic and len(arities) == 1:
+        n = arities[0]
+        params = ", ".join("a%d" % i for i in range(n))
+        lines = ["def %s(%s):" % (name, params)]
+        lines += branch(n, 1)
+        call = "func(%s)" % params
+        types = "(%s)" % "".join("type(a%d), " % i for i in range(n))
+        fallback = "_fallback(%s, (%s), {})" % (
+            types,
+            "".join("a%d, " % i for i in range(n)),
+        )
+    else:
+        lines = ["def %s(*args):" % name, "    n = len(args)"]
+        for i, n in enumerate(arities):
+            lines.append("    %s n == %d:" % ("elif" if i else "if", n))
+            if n:
+                lines.append(
+                    "        %s= args" % "".join("a%d, " % j for j in range(n))
+                )
+            lines += branch(n, 2)
+        if arities:
+            lines.append("    else:")
+        pad = "        " if arities else "    "
+        lines.append("%stypes = tuple([type(arg) for arg in args])" % pad)
+        if variadic:
+            # Keys of variadic calls as in ``Dispatcher.__call__``
+            arity = dispatcher._arity
+            lines.append(
+                "%skey = types if n <= %d else _variadic_key(types, %d)"
+                % (pad, arity, arity)
+            )
+            lines += lookup("key", pad, "types, key")
+        else:
+            lines += lookup("types", pad)
+        call = "func(*args)"
+        fallback = "_fallback(tuple([type(arg) for arg in args]), args, {})"
+
+    if dispatcher._not_implemented is None:
+        lines += [
+            "    try:",
+            "        return %s" % call,
+            "    except _MDNotImplementedError:",
+            "        return %s" % fallback,
+        ]
+    else:
+        lines += [
+            "    try:",
+            "        result = %s" % call,
+            "    except _MDNotImplementedError:",
+            "        return %s" % fallback,
+            "    if result is _not_implemented:",
+            "        return %s" % fallback,
+            "    return result",
+        ]
+    return "\n".join(lines) + "\n", ns
+
+
+def compile_dispatcher(dispatcher, func=None):
+    """Compile a function specialized to the implementations of ``dispatcher``
+
+    If ``func``, a function returned by an earlier call, is given then its
+    code is replaced so that existing references to it see the current
+    implementations.
+    """
+    name = function_name(dispatcher.name)
+    source, ns = generate(dispatcher, name)
+    if func is None:
+        glbs = ns
+    else:
+        glbs = func.__globals__
+        glbs.clear()
+        glbs.update(ns)
+    exec(compile(source, "<dispatch %s>" % name, "exec"), glbs)
+    compiled = glbs.pop(name)
+    if func is None:
+        func = compiled
+        func.__name__ = func.__qualname__ = dispatcher.name
+    else:
+        func.__code__ = compiled.__code__
+    glbs["_recompile"] = partial(compile_dispatcher, dispatcher, func)
+    return func
+
+
+def invalidate(func):
+    """Recompile ``func`` on its next call"""
+    func.__code__ = STALE_CODE
@@ -1,3 +1,5 @@
+import itertools
+
 from .utils import _toposort, groupby
 from .variadic import isvariadic
 
@@ -76,14 +78,93 @@ def ambiguous(a, b):
 def ambiguities(signatures):
     """All signature pairs such that A is ambiguous with B"""
     signatures = list(map(tuple, signatures))
-    return set(
+    pairs = [
         (a, b)
         for a in signatures
         for b in signatures
+        if hash(a) < hash(b) and ambiguous(a, b)
+    ]
+    # Signatures superceding each member of a pair, computed once per member
+    above = dict()
+    for sig in itertools.chain.from_iterable(pairs):
+        if sig not in above:
+            above[sig] = set(c for c in signatures if supercedes(c, sig))
+    return set((a, b) for a, b in pairs if not above[a] & above[b])
+
+
+def update_ambiguities(ambiguities, signatures, signature):
+    """Update ``ambiguities`` in place for a newly added ``signature``
+
+    ``ambiguities`` is a set as returned by ``ambiguities(signatures)``
+    before ``signature`` was added, and ``signatures`` includes
+    ``signature``.  Pairs that ``signature`` resolves are dropped and only
+    pairs involving ``signature`` are checked for new ambiguities, so this
+    costs ``O(len(signatures))`` rather than recomputing all pairs.
+
+    Returns the set of newly introduced ambiguities.
+
+    >>> amb = ambiguities([(object, float), (float, object)])
+    >>> update_ambiguities(amb, [(object, float), (float, object), (float, float)],
+    ...                    (float, float))
+    set()
+    >>> amb
+    set()
+    """
+    signature = tuple(signature)
+    signatures = list(map(tuple, signatures))
+    for a, b in list(ambiguities):
+        if supercedes(signature, a) and supercedes(signature, b):
+            ambiguities.discard((a, b))
+
+    new = set()
+    for other in signatures:
+        a, b = (
+            (signature, other) if hash(signature) < hash(other) else (other, signature)
+        )
+        if (
+            hash(a) < hash(b)
+            and ambiguous(a, b)
+            and not any(supercedes(c, a) and supercedes(c, b) for c in signatures)
+        ):
+            new.add((a, b))
+    ambiguities.update(new)
+    return new
+
+
+def remove_ambiguities(ambiguities, signatures, signature):
+    """Update ``ambiguities`` in place for a removed ``signature``
+
+    ``ambiguities`` is a set as returned by ``ambiguities(signatures)``
+    before ``signature`` was removed, and ``signatures`` no longer includes
+    ``signature``.  Pairs involving ``signature`` are dropped, and only
+    pairs of signatures that ``signature`` superceded are checked again, as
+    only their ambiguities may have been resolved by it.
+
+    Returns the set of newly introduced ambiguities.
+
+    >>> sigs = [(object, float), (float, object), (float, float)]
+    >>> amb = ambiguities(sigs)
+    >>> sorted(remove_ambiguities(amb, sigs[:2], (float, float))) == sorted(
+    ...     ambiguities(sigs[:2]))
+    True
+    """
+    signature = tuple(signature)
+    signatures = list(map(tuple, signatures))
+    for pair in list(ambiguities):
+        if signature in pair:
+            ambiguities.discard(pair)
+
+    below = [other for other in signatures if supercedes(signature, other)]
+    new = set(
+        (a, b)
+        for a in below
+        for b in below
         if hash(a) < hash(b)
         and ambiguous(a, b)
         and not any(supercedes(c, a) and supercedes(c, b) for c in signatures)
     )
+    ambiguities.update(new)
+    return new
 
 
 def super_signature(signatures):
@@ -109,9 +190,24 @@ def edge(a, b, tie_breaker=hash):
 def ordering(signatures):
     """A sane ordering of signatures to check, first to last
 
-    Topoological sort of edges as given by ``edge`` and ``supercedes``
+    Signatures are inserted in turn, in the order given, with
+    ``insert_signature``.  Inserting more signatures into the ordering of
+    some signatures thus gives the ordering of all of them, so that a
+    dispatcher extending its ordering as signatures are registered orders
+    them as if they had all been registered at once.  Signatures that do not
+    supercede each other keep the order in which they were inserted.
+
+    Falls back to a topological sort of edges as given by ``edge`` and
+    ``supercedes`` if a signature can not be inserted.
     """
     signatures = list(map(tuple, signatures))
+    od = []
+    try:
+        for signature in signatures:
+            insert_signature(od, signature)
+        return od
+    except ValueError:
+        pass
     edges = [(a, b) for a in signatures for b in signatures if edge(a, b)]
     edges = groupby(lambda x: x[0], edges)
     for s in signatures:
@@ -119,3 +215,57 @@ def ordering(signatures):
             edges[s] = []
     edges = dict((k, [b for a, b in v]) for k, v in edges.items())
     return _toposort(edges)
+
+
+def insert_signature(ordering, signature):
+    """Insert a signature into an existing ``ordering`` in place
+
+    The signature is placed after every signature that has an ``edge`` to it
+    and before every signature it has an ``edge`` to, so that only ``len(
+    ordering)`` pairs are compared.  Returns the position of the signature.
+
+    >>> od = ordering([(object,), (int,)])
+    >>> insert_signature(od, (bool,))
+    0
+    >>> od == [(bool,), (int,), (object,)]
+    True
+
+    Raises ``ValueError`` if no such position exists, in which case the full
+    ``ordering`` should be recomputed.
+    """
+    signature = tuple(signature)
+    lo, hi = 0, len(ordering)
+    for i, other in enumerate(ordering):
+        if edge(other, signature):
+            lo = i + 1
+        elif hi > i and edge(signature, other):
+            hi = i
+    if lo > hi:
+        raise ValueError("Signature %s can not be inserted in order" % (signature,))
+    ordering.insert(lo, signature)
+    return lo
+
+
+def remove_signatures(ordering, signatures, later=()):
+    """Remove signatures from an existing ``ordering`` in place
+
+    ``later`` are the remaining signatures inserted after the first of
+    ``signatures``, in order.  Their position may depend on the removed
+    signatures, so they are inserted again and ``ordering`` becomes the
+    ``ordering`` of the remaining signatures.  Returns the first position
+    that changed.
+
+    >>> od = ordering([(object,), (int,), (float,)])
+    >>> remove_signatures(od, [(object,)], [(int,), (float,)])
+    0
+    >>> od == ordering([(int,), (float,)])
+    True
+    """
+    later = list(map(tuple, later))
+    removed = set(later)
+    removed.update(map(tuple, signatures))
+    start = min(i for i, other in enumerate(ordering) if other in removed)
+    ordering[:] = [other for other in ordering if other not in removed]
+    for other in later:
+        start = min(start, insert_signature(ordering, other))
+    return start
@@ -1,10 +1,16 @@
-import inspect
+from contextlib import ExitStack, contextmanager
 import sys
+from types import FunctionType
 
 from .dispatcher import Dispatcher, MethodDispatcher, ambiguity_warn
+from .stats import aggregate
 
 global_namespace = dict()
 
+# Code object flags, as in the ``inspect`` module
+CO_VARARGS = 0x04
+CO_VARKEYWORDS = 0x08
+
 
 def dispatch(*types, **kwargs):
     """Dispatch function on the types of the inputs
@@ -39,6 +45,15 @@ def dispatch(*types, **kwargs):
     ... def foo(x):
     ...     return x + 1
 
+    Bound the resolution cache of a new dispatcher with ``cache_size``, hold
+    its keys weakly with ``weak_cache``, let its implementations decline
+    inputs by returning ``not_implemented``, or record runtime statistics
+    with ``stats``, see ``Dispatcher``
+
+    >>> @dispatch(int, namespace=my_namespace, cache_size=256)
+    ... def bar(x):
+    ...     return x + 1
+
     Dispatch on instance methods within classes
 
     >>> class MyClass(object):
@@ -50,6 +65,12 @@ def dispatch(*types, **kwargs):
     ...         self.data = [datum]
     """
     namespace = kwargs.get("namespace", global_namespace)
+    options = dict(
+        cache_size=kwargs.get("cache_size"),
+        not_implemented=kwargs.get("not_implemented"),
+        weak_cache=kwargs.get("weak_cache", False),
+        stats=kwargs.get("stats", id(namespace) in _collecting),
+    )
 
     types = tuple(types)
 
@@ -57,13 +78,15 @@ def dispatch(*types, **kwargs):
         name = func.__name__
 
         if ismethod(func):
-            dispatcher = inspect.currentframe().f_back.f_locals.get(
+            dispatcher = sys._getframe(1).f_locals.get(
                 name,
-                MethodDispatcher(name),
+                MethodDispatcher(name, **options),
             )
         else:
             if name not in namespace:
-                namespace[name] = Dispatcher(name)
+                namespace[name] = Dispatcher(name, **options)
+                if id(namespace) in _batches:
+                    _batches[id(namespace)](namespace[name])
             dispatcher = namespace[name]
 
         dispatcher.add(types, func)
@@ -72,18 +95,149 @@ def dispatch(*types, **kwargs):
     return _df
 
 
+def unregister(name, *types, **kwargs):
+    """Remove implementations registered with ``dispatch``
+
+    Removes the implementation of the function ``name`` for the signature
+    ``types``, see ``Dispatcher.remove``.  Without types the dispatcher is
+    removed from the namespace altogether and returned, so that the next
+    ``dispatch`` of that name starts afresh.  Takes the ``namespace`` and
+    ``on_ambiguity`` keyword arguments.
+
+    >>> my_namespace = dict()
+    >>> @dispatch(int, namespace=my_namespace)
+    ... def f(x):
+    ...     return x + 1
+    >>> @dispatch(float, namespace=my_namespace)
+    ... def f(x):
+    ...     return x - 1
+    >>> unregister('f', float, namespace=my_namespace)
+    >>> f(1.0)
+    Traceback (most recent call last):
+    ...
+    NotImplementedError: Could not find signature for f: <float>
+    >>> unregister('f', namespace=my_namespace)
+    <dispatched f>
+    >>> 'f' in my_namespace
+    False
+    """
+    namespace = kwargs.pop("namespace", global_namespace)
+    if not types:
+        return namespace.pop(name)
+    namespace[name].remove(*types, **kwargs)
+
+
 def ismethod(func):
     """Is func a method?
 
     Note that this has to work as the method is defined but before the class is
     defined.  At this stage methods look like functions.
+
+    Plain functions are recognized from their code object, other callables
+    through ``inspect.signature``.  Bound methods forward ``__code__`` to
+    their function, but their signature lacks ``self``.
+    """
+    if not isinstance(func, FunctionType) or hasattr(func, "__wrapped__"):
+        from inspect import signature
+
+        return signature(func).parameters.get("self", None) is not None
+    code = func.__code__
+    nparams = code.co_argcount + code.co_kwonlyargcount
+    nparams += bool(code.co_flags & CO_VARARGS) + bool(code.co_flags & CO_VARKEYWORDS)
+    return "self" in code.co_varnames[:nparams]
+
+
+_batches = dict()
+
+
+@contextmanager
+def batch(namespace=global_namespace, on_ambiguity=ambiguity_warn):
+    """Defer ordering and ambiguity work for all dispatchers in a namespace
+
+    Every dispatcher in ``namespace``, including those created within the
+    block, queues its registrations until the block exits and then updates
+    its ordering and ambiguities once.  Pass ``on_ambiguity=None`` to skip
+    ambiguity detection altogether.
+
+    >>> my_namespace = dict()
+    >>> with batch(my_namespace):
+    ...     @dispatch(int, namespace=my_namespace)
+    ...     def f(x):
+    ...         return x + 1
+    ...     @dispatch(float, namespace=my_namespace)
+    ...     def f(x):
+    ...         return x - 1
+    >>> f(1)
+    2
+
+    See Also:
+        Dispatcher.batch
+    """
+    key = id(namespace)
+    if key in _batches:
+        yield
+        return
+    with ExitStack() as stack:
+
+        def enter(dispatcher):
+            stack.enter_context(dispatcher.batch(on_ambiguity))
+
+        for dispatcher in list(namespace.values()):
+            enter(dispatcher)
+        _batches[key] = enter
+        try:
+            yield
+        finally:
+            del _batches[key]
+
+
+#: Ids of the namespaces whose dispatchers collect statistics
+_collecting = set()
+
+
+def collect_stats(enabled=True, namespace=global_namespace):
+    """Start or stop recording runtime statistics in a namespace
+
+    Every dispatcher in ``namespace``, including those created later by
+    ``dispatch``, records statistics until stopped.
+
+    See Also:
+        Dispatcher.collect_stats
+        stats
     """
-    if hasattr(inspect, "signature"):
-        signature = inspect.signature(func)
-        return signature.parameters.get("self", None) is not None
+    if enabled:
+        _collecting.add(id(namespace))
     else:
-        if sys.version_info.major < 3:
-            spec = inspect.getargspec(func)
-        else:
-            spec = inspect.getfullargspec(func)
-        return spec and spec.args and spec.args[0] == "self"
+        _collecting.discard(id(namespace))
+    for dispatcher in namespace.values():
+        dispatcher.collect_stats(enabled)
+
+
+def stats(namespace=global_namespace):
+    """Runtime statistics summed over the dispatchers of a namespace
+
+    Only dispatchers collecting statistics are included, and calls are
+    counted by function name and signature.
+
+    >>> my_namespace = dict()
+    >>> collect_stats(namespace=my_namespace)
+    >>> @dispatch(int, namespace=my_namespace)
+    ... def f(x):
+    ...     return x + 1
+    >>> @dispatch(str, namespace=my_namespace)
+    ... def g(x):
+    ...     return x * 2
+    >>> _ = f(1), f(2), g('a')
+    >>> stats(my_namespace).calls == {('f', (int,)): 2, ('g', (str,)): 1}
+    True
+    >>> collect_stats(False, namespace=my_namespace)
+
+    See Also:
+        Dispatcher.stats
+    """
+    found = dict()
+    for name, dispatcher in namespace.items():
+        dispatcher_stats = dispatcher.stats()
+        if dispatcher_stats is not None:
+            found[name] = dispatcher_stats
+    return aggregate(found)
@@ -1,8 +1,33 @@
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from types import FunctionType
 from warnings import warn
-import inspect
-from .conflict import ordering, ambiguities, super_signature, AmbiguityWarning
+from .conflict import (
+    ordering,
+    ambiguities,
+    insert_signature,
+    remove_signatures,
+    update_ambiguities,
+    remove_ambiguities,
+    super_signature,
+    AmbiguityWarning,
+)
+from .cache import WeakKeys, make_cache
+from .variadic import Variadic, variadic_arity, variadic_key
+
+# Defined here before, re-exported for backwards compatibility
+from .variadic import (  # noqa: F401
+    isvariadic,
+    variadic_signature_matches,
+    variadic_signature_matches_iter,
+)
+from .index import SignatureIndex, matches
+from .stats import Stats, counted
+from .union import Union, union_types
 from .utils import expand_tuples
-from .variadic import Variadic, isvariadic
+from .lazy import haslazy, parse, resolve_signature
 import itertools as itl
 
 
@@ -45,54 +70,6 @@ def restart_ordering(on_ambiguity=ambiguity_warn):
     )
 
 
-def variadic_signature_matches_iter(types, full_signature):
-    """Check if a set of input types matches a variadic signature.
-
-    Notes
-    -----
-    The algorithm is as follows:
-
-    Initialize the current signature to the first in the sequence
-
-    For each type in `types`:
-        If the current signature is variadic
-            If the type matches the signature
-                yield True
-            Else
-                Try to get the next signature
-                If no signatures are left we can't possibly have a match
-                    so yield False
-        Else
-            yield True if the type matches the current signature
-            Get the next signature
-    """
-    sigiter = iter(full_signature)
-    sig = next(sigiter)
-    for typ in types:
-        matches = issubclass(typ, sig)
-        yield matches
-        if not isvariadic(sig):
-            # we're not matching a variadic argument, so move to the next
-            # element in the signature
-            sig = next(sigiter)
-    else:
-        try:
-            sig = next(sigiter)
-        except StopIteration:
-            assert isvariadic(sig)
-            yield True
-        else:
-            # We have signature items left over, so all of our arguments
-            # haven't matched
-            yield False
-
-
-def variadic_signature_matches(types, full_signature):
-    # No arguments always matches a variadic signature
-    assert full_signature
-    return all(variadic_signature_matches_iter(types, full_signature))
-
-
 class Dispatcher(object):
     """Dispatch methods based on type signature
 
@@ -114,16 +91,114 @@ class Dispatcher(object):
     4
     >>> f(3.0)
     2.0
+
+    Resolved implementations are cached by input types.  Pass ``cache_size``
+    to bound the cache to that many least recently used entries, or ``0`` to
+    disable caching.  Pass ``weak_cache=True`` to hold input types weakly in
+    the cache, so that dynamically created classes may still be garbage
+    collected, at some cost per call.  ``cache_info`` reports cache
+    statistics.  Input types without implementation are cached as well.
+    Registering a signature only drops the entries of input types that match
+    it.
+
+    Pass ``stats=True``, or call ``collect_stats``, to record calls per
+    implementation, fallbacks and the time spent resolving implementations,
+    as reported by ``stats``.
+
+    Implementations decline inputs by raising ``MDNotImplementedError``, and
+    the next most specific implementation is called instead.  Pass a value
+    other than None as ``not_implemented``, such as ``NotImplemented``, to
+    also let them decline by returning that value, like the binary operators
+    of Python.  This avoids the cost of raising exceptions when inputs are
+    declined.  Such dispatchers are instances of a subclass, see
+    ``DeclinableDispatcher``, whose ``__call__`` checks the result inline,
+    so that dispatchers without ``not_implemented`` pay nothing for it.
+
+    >>> g = Dispatcher('g', not_implemented=NotImplemented)
+    >>> g.add((object,), lambda x: 'object')
+    >>> g.add((int,), lambda x: 'even' if x % 2 == 0 else NotImplemented)
+    >>> g(2), g(3)
+    ('even', 'object')
     """
 
-    __slots__ = "__name__", "name", "funcs", "_ordering", "_cache", "doc"
+    __slots__ = (
+        "__name__",
+        "name",
+        "funcs",
+        "_expanded",
+        "_ordering",
+        "_ambiguities",
+        "_index",
+        "_cache",
+        "_chains",
+        "_queue",
+        "_compiled",
+        "_single",
+        "_arity",
+        "_lazy",
+        "_not_implemented",
+        "_stats",
+        "_shared",
+        "doc",
+    )
+
+    #: Subclass whose instances check the results of implementations for
+    #: ``not_implemented``, see ``DeclinableDispatcher``
+    _declinable = None
+
+    #: State replaced within ``override`` and restored on exit
+    _state = (
+        "funcs",
+        "_expanded",
+        "_ordering",
+        "_ambiguities",
+        "_index",
+        "_cache",
+        "_chains",
+        "_queue",
+        "_single",
+        "_arity",
+        "_lazy",
+        "_shared",
+    )
 
-    def __init__(self, name, doc=None):
+    def __init__(
+        self,
+        name,
+        doc=None,
+        cache_size=None,
+        not_implemented=None,
+        weak_cache=False,
+        stats=False,
+    ):
         self.name = self.__name__ = name
         self.funcs = {}
+        self._expanded = {}
         self.doc = doc
 
-        self._cache = {}
+        self._cache = make_cache(cache_size, weak_cache)
+        self._chains = make_cache(cache_size, weak_cache)
+        self._queue = None
+        self._compiled = None
+        self._single = True
+        self._arity = sys.maxsize
+        self._lazy = set()
+        self._not_implemented = not_implemented
+        self._stats = Stats() if stats else None
+        self._shared = False
+        if not_implemented is not None:
+            self._set_declinable()
+
+    def _set_declinable(self):
+        """Switch to the variant of this class checking implementations'
+        results for ``not_implemented``, see ``DeclinableDispatcher``"""
+        cls = self._declinable
+        if cls is None or not issubclass(cls, type(self)):
+            raise TypeError(
+                "%s does not support not_implemented, its _declinable class "
+                "must be a subclass checking for it" % type(self).__name__
+            )
+        self.__class__ = cls
 
     def register(self, *types, **kwargs):
         """register dispatcher with new implementation
@@ -158,18 +233,64 @@ class Dispatcher(object):
 
         return _df
 
+    def register_batch(self, *types, **kwargs):
+        """register an implementation that handles many inputs at once
+
+        The implementation receives one list per argument position, holding
+        the arguments of every call in a group, and returns the results in
+        the same order.  ``map`` and ``starmap`` pass it all inputs that
+        resolve to it in one call, while calling the dispatcher directly
+        passes single element lists.
+
+        >>> f = Dispatcher('f')
+        >>> @f.register_batch(int)
+        ... def inc(xs):
+        ...     return [x + 1 for x in xs]
+
+        >>> f.map([1, 2, 3])
+        [2, 3, 4]
+        >>> f(1)
+        2
+        """
+
+        def _df(func):
+            self.add(types, batch_implementation(func), **kwargs)
+            return func
+
+        return _df
+
     @classmethod
     def get_func_params(cls, func):
-        if hasattr(inspect, "signature"):
-            sig = inspect.signature(func)
-            return sig.parameters.values()
+        from inspect import signature
+
+        return signature(func).parameters.values()
+
+    @classmethod
+    def get_func_param_names(cls, func):
+        """Names of the positional parameters of a plain function
+
+        Read from the code object, so None for other callables, including
+        bound methods, and for wrappers, whose signature is that of the
+        function they wrap.
+        """
+        if not isinstance(func, FunctionType) or hasattr(func, "__wrapped__"):
+            return None
+        code = func.__code__
+        return code.co_varnames[: code.co_argcount]
 
     @classmethod
     def get_func_annotations(cls, func):
         """get annotations of function positional parameters"""
+        names = cls.get_func_param_names(func)
+        if names is not None:
+            annotations = getattr(func, "__annotations__", None) or {}
+            if names and all(name in annotations for name in names):
+                return tuple(annotations[name] for name in names)
+            return None
+
         params = cls.get_func_params(func)
         if params:
-            Parameter = inspect.Parameter
+            from inspect import Parameter
 
             params = (
                 param
@@ -183,7 +304,7 @@ class Dispatcher(object):
             if all(ann is not Parameter.empty for ann in annotations):
                 return annotations
 
-    def add(self, signature, func):
+    def add(self, signature, func, on_ambiguity=ambiguity_warn):
         """Add new types/method pair to dispatcher
 
         >>> D = Dispatcher('add')
@@ -200,23 +321,28 @@ class Dispatcher(object):
         When ``add`` detects a warning it calls the ``on_ambiguity`` callback
         with a dispatcher/itself, and a set of ambiguous type signature pairs
         as inputs.  See ``ambiguity_warn`` for an example.
+
+        The ordering of signatures is computed lazily on first use.  Once it
+        exists, new signatures are inserted into it rather than recomputing
+        it from scratch.
         """
         # Handle annotations
         if not signature:
             annotations = self.get_func_annotations(func)
             if annotations:
                 signature = annotations
-
-        # Handle union types
-        if any(isinstance(typ, tuple) for typ in signature):
-            for typs in expand_tuples(signature):
-                self.add(typs, func)
-            return
+        else:
+            # Handle dotted names of types, see ``lazy_type``
+            signature = tuple(map(parse, signature))
 
         new_signature = []
 
         for index, typ in enumerate(signature, start=1):
-            if not isinstance(typ, (type, list)):
+            if isinstance(typ, tuple):
+                valid = typ and all(isinstance(t, type) for t in typ)
+            else:
+                valid = isinstance(typ, (type, list))
+            if not valid:
                 str_sig = ", ".join(
                     c.__name__ if isinstance(c, type) else str(c) for c in signature
                 )
@@ -238,16 +364,327 @@ class Dispatcher(object):
                         "inside of a tuple, e.g., [(int, str)]"
                     )
                 new_signature.append(Variadic[typ[0]])
+            elif isinstance(typ, tuple):
+                # One entry in funcs, ordered by the signatures it expands to
+                new_signature.append(Union[typ])
             else:
                 new_signature.append(typ)
 
-        self.funcs[tuple(new_signature)] = func
-        self._cache.clear()
+        signature = tuple(new_signature)
+        if self._queue is not None:
+            self._queue.append((signature, func))
+        else:
+            self._extend([(signature, func)], on_ambiguity)
+
+    def _extend(self, items, on_ambiguity):
+        """Register signature/function pairs
+
+        Signatures with union types are stored once in ``funcs``, but are
+        ordered and checked for ambiguities by the signatures of single types
+        they expand to, see ``expand_signature``.  These are mapped to the
+        last registered signature expanding to them.
+
+        New signatures are inserted into the ordering, if it has been
+        computed, and only the newly introduced ambiguities are reported.
+        Replacing the implementation of an existing signature keeps the
+        ordering, and cached resolutions to the old implementation are
+        pointed to the new one.
+        """
+        funcs = self.funcs
+        expanded = self._expanded
+        new = list(dict.fromkeys(sig for sig, _ in items if sig not in funcs))
+        replaced = dict(
+            (sig, funcs[sig]) for sig, func in items if funcs.get(sig, func) is not func
+        )
+        funcs.update(items)
+        added = []
+        claimed = []
+        for sig, _ in items:
+            for signature in expand_signature(sig):
+                owner = expanded.get(signature)
+                if owner is None:
+                    added.append(signature)
+                elif owner != sig:
+                    claimed.append(signature)
+                expanded[signature] = sig
+        self._lazy.update(sig for sig in new if haslazy(sig))
+        if new:
+            self._arity = variadic_arity(funcs)
+        single = self._single and all(len(sig) == 1 for sig, _ in items)
+        if single == self._single:
+            # Implementations shared with other signatures can't be replaced
+            # in cached resolutions, as they may have resolved to those.
+            # Neither can implementations wrapped to count their calls.
+            if self._stats is not None:
+                shared = set(replaced.values())
+            else:
+                shared = set(funcs.values()) if replaced else ()
+            self._invalidate(
+                new + claimed + [s for s in replaced if replaced[s] in shared]
+            )
+            self._replace(
+                dict(
+                    (old, funcs[sig])
+                    for sig, old in replaced.items()
+                    if old not in shared
+                )
+            )
+        else:
+            # Cache keys change from types to tuples of types
+            self._single = single
+            self._cache.clear()
+            self._chains.clear()
+        if self._compiled is not None:
+            from .codegen import invalidate
+
+            invalidate(self._compiled)
 
         try:
-            del self._ordering
+            od = self._ordering
         except AttributeError:
-            pass
+            return
+        if not added:
+            return
+        if self._shared:
+            od = self._unshare()
+        amb = set()
+        for signature in added:
+            try:
+                position = insert_signature(od, signature)
+            except ValueError:
+                self.reorder(on_ambiguity)
+                return
+            self._index.add(signature)
+            self._index.rerank(od, position)
+            if on_ambiguity is not None and self._ambiguities is not None:
+                amb |= update_ambiguities(self._ambiguities, expanded, signature)
+
+        if on_ambiguity is None:
+            self._ambiguities = None
+        elif self._ambiguities is None:
+            self._ambiguities = ambiguities(expanded)
+            amb = set(pair for pair in self._ambiguities if set(pair) & set(added))
+        else:
+            amb &= self._ambiguities
+        if amb:
+            on_ambiguity(self, amb)
+
+    def _invalidate(self, signatures):
+        """Drop cached resolutions of input types matching ``signatures``
+
+        Only these input types may resolve differently after registering
+        ``signatures``, all other entries are kept.
+        """
+        for cache in (self._cache, self._chains):
+            for key in list(cache):
+                types = key if isinstance(key, tuple) else (key,)
+                if any(matches(types, sig) for sig in signatures):
+                    del cache[key]
+
+    def _replace(self, replacements):
+        """Point cached resolutions to replaced implementations to their
+        replacements, given as a mapping from old to new implementations"""
+        if not replacements:
+            return
+        cache = self._cache
+        for key, func in list(cache.items()):
+            if func in replacements:
+                cache[key] = replacements[func]
+
+    def remove(self, *types, **kwargs):
+        """Remove the implementation registered for a type signature
+
+        Signatures are given as to ``add``, a union type removing the
+        signature registered with the same union.  The signatures it expands
+        to go back to the last other signature expanding to them, if any, or
+        are removed from the ordering, into which the signatures registered
+        after them are inserted again.  Only the cached resolutions of input
+        types matching it are dropped.  Ambiguities that it resolved are
+        reported again to the ``on_ambiguity`` keyword argument, which
+        defaults to ``ambiguity_warn``.
+
+        >>> f = Dispatcher('f')
+        >>> f.add((object,), lambda x: 'object')
+        >>> f.add((int,), lambda x: 'int')
+        >>> f(1)
+        'int'
+        >>> f.remove(int)
+        >>> f(1)
+        'object'
+
+        Raises ``KeyError`` if no implementation is registered for the
+        signature.
+        """
+        on_ambiguity = kwargs.get("on_ambiguity", ambiguity_warn)
+        signature = signature_key(types)
+        queued = False
+        if self._queue:
+            queue = [item for item in self._queue if item[0] != signature]
+            queued = len(queue) != len(self._queue)
+            self._queue[:] = queue
+        if signature not in self.funcs:
+            if queued:
+                return
+            raise KeyError(
+                "No implementation of %s for <%s>"
+                % (self.name, str_signature(signature))
+            )
+
+        signatures = list(self._expanded)
+        del self.funcs[signature]
+        self._lazy.discard(signature)
+        removed = self._drop_expansions([signature])
+        self._arity = variadic_arity(self.funcs)
+        self._invalidate([signature])
+        if self._compiled is not None:
+            from .codegen import invalidate
+
+            invalidate(self._compiled)
+
+        try:
+            od = self._ordering
+        except AttributeError:
+            return
+        if not removed:
+            return
+        if self._shared:
+            od = self._unshare()
+        first = min(map(signatures.index, removed))
+        later = [sig for sig in signatures[first + 1 :] if sig in self._expanded]
+        try:
+            position = remove_signatures(od, removed, later)
+        except ValueError:
+            self.reorder(on_ambiguity)
+            return
+        for signature in removed:
+            self._index.remove(signature)
+        self._index.rerank(od, position)
+        if on_ambiguity is None:
+            self._ambiguities = None
+        elif self._ambiguities is None:
+            self._ambiguities = amb = ambiguities(self._expanded)
+            if amb:
+                on_ambiguity(self, amb)
+        else:
+            remaining = list(self._expanded) + removed
+            amb = set()
+            for signature in removed:
+                remaining.remove(signature)
+                amb |= remove_ambiguities(self._ambiguities, remaining, signature)
+            amb &= self._ambiguities
+            if amb:
+                on_ambiguity(self, amb)
+
+    def _drop_expansions(self, signatures):
+        """Unmap the expansions of signatures removed from ``funcs``
+
+        Expansions go back to the last remaining signature expanding to them,
+        if any.  Returns the others, which are removed.
+        """
+        expanded = self._expanded
+        remaining = list(self.funcs)[::-1]
+        removed = []
+        for sig in signatures:
+            for signature in expand_signature(sig):
+                if expanded.get(signature) != sig:
+                    continue
+                for other in remaining:
+                    if signature in expand_signature(other):
+                        expanded[signature] = other
+                        break
+                else:
+                    del expanded[signature]
+                    removed.append(signature)
+        return removed
+
+    @contextmanager
+    def batch(self, on_ambiguity=ambiguity_warn):
+        """Defer ordering and ambiguity work for many registrations
+
+        Registrations made within the block are queued and take effect when
+        it exits.  The ordering and ambiguities are then updated once, with
+        ``on_ambiguity`` called at most once.  Pass ``on_ambiguity=None`` to
+        skip ambiguity detection altogether.
+
+        >>> f = Dispatcher('f')
+        >>> with f.batch():
+        ...     f.add((int,), lambda x: x + 1)
+        ...     f.add((float,), lambda x: x - 1)
+        >>> f(1)
+        2
+
+        See Also:
+            multipledispatch.core.batch
+        """
+        if self._queue is not None:
+            yield self
+            return
+        self._queue = []
+        try:
+            yield self
+        finally:
+            queue, self._queue = self._queue, None
+            if queue:
+                self._extend(queue, on_ambiguity)
+                if not hasattr(self, "_ordering"):
+                    self.reorder(on_ambiguity)
+
+    @contextmanager
+    def override(self, signature, func, on_ambiguity=ambiguity_warn):
+        """Register ``func`` for ``signature`` within a block only
+
+        On exit the dispatcher is restored to its state on entry, undoing any
+        registration or removal made within the block.  The state is saved by
+        reference: the block works on a shallow copy of ``funcs`` and a new
+        resolution cache, while the ordering is only copied if the block adds
+        a new signature.  Overriding an existing signature thus keeps the
+        ordering, and restoring takes constant time and brings back the warm
+        cache.
+
+        >>> f = Dispatcher('f')
+        >>> f.add((int,), lambda x: x + 1)
+        >>> with f.override((int,), lambda x: 0):
+        ...     f(1)
+        0
+        >>> f(1)
+        2
+        """
+        saved = [
+            (attr, getattr(self, attr)) for attr in self._state if hasattr(self, attr)
+        ]
+        self.funcs = dict(self.funcs)
+        self._expanded = dict(self._expanded)
+        weak = isinstance(self._cache, WeakKeys)
+        self._cache = make_cache(self._cache.maxsize, weak)
+        self._chains = make_cache(self._chains.maxsize, weak)
+        self._queue = None
+        self._lazy = set(self._lazy)
+        self._shared = True
+        try:
+            self.add(signature, func, on_ambiguity)
+            yield self
+        finally:
+            for attr in self._state:
+                if hasattr(self, attr):
+                    delattr(self, attr)
+            for attr, value in saved:
+                setattr(self, attr, value)
+            if self._compiled is not None:
+                from .codegen import invalidate
+
+                invalidate(self._compiled)
+
+    def _unshare(self):
+        """Copy the ordering, index and ambiguities before changing them
+
+        They may be shared with the state saved by ``override``.
+        """
+        self._ordering = od = list(self._ordering)
+        self._index = SignatureIndex(od)
+        if self._ambiguities is not None:
+            self._ambiguities = set(self._ambiguities)
+        self._shared = False
+        return od
 
     @property
     def ordering(self):
@@ -257,45 +694,257 @@ class Dispatcher(object):
             return self.reorder()
 
     def reorder(self, on_ambiguity=ambiguity_warn):
-        self._ordering = od = ordering(self.funcs)
-        amb = ambiguities(self.funcs)
+        """Recompute the ordering of signatures from scratch
+
+        All ambiguities are passed to ``on_ambiguity``, which may be ``None``
+        to skip ambiguity detection.
+        """
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
+        self._ordering = od = ordering(self._expanded)
+        self._index = SignatureIndex(od)
+        self._shared = False
+        if on_ambiguity is None:
+            self._ambiguities = amb = None
+        else:
+            self._ambiguities = amb = ambiguities(self._expanded)
+        if stats is not None:
+            stats.reorder_time += perf_counter() - start
         if amb:
             on_ambiguity(self, amb)
         return od
 
     def __call__(self, *args, **kwargs):
+        cache = self._cache
+        if self._single and len(args) == 1 and not kwargs:
+            # Fast path when every signature takes a single argument
+            (arg,) = args
+            typ = type(arg)
+            try:
+                func = cache[typ]
+                cache.hits += 1
+            except KeyError:
+                func = self._resolve((typ,), typ)
+            try:
+                return func(arg)
+            except MDNotImplementedError:
+                return self._fallback((typ,), args, kwargs)
+
         types = tuple([type(arg) for arg in args])
+        key = types if len(types) <= self._arity else variadic_key(types, self._arity)
         try:
-            func = self._cache[types]
+            func = cache[key]
+            cache.hits += 1
         except KeyError:
-            func = self.dispatch(*types)
-            if not func:
-                raise NotImplementedError(
-                    "Could not find signature for %s: <%s>"
-                    % (self.name, str_signature(types))
-                )
-            self._cache[types] = func
+            func = self._resolve(types, key)
         try:
             return func(*args, **kwargs)
 
         except MDNotImplementedError:
-            funcs = self.dispatch_iter(*types)
-            next(funcs)  # burn first
-            for func in funcs:
-                try:
-                    return func(*args, **kwargs)
-                except MDNotImplementedError:
-                    pass
-
-            raise NotImplementedError(
-                "Matching functions for "
-                "%s: <%s> found, but none completed successfully"
-                % (
-                    self.name,
-                    str_signature(types),
-                ),
+            return self._fallback(types, args, kwargs)
+
+    def _resolve(self, types, key=None):
+        """Dispatch on a cache miss and cache the result
+
+        The result is cached under ``key``, which defaults to ``types``.
+        Variadic calls with many arguments are cached under shorter keys,
+        see ``variadic_key``.
+        Types without implementation are cached too, with a function that
+        raises ``NotImplementedError``, so that repeated misses only cost a
+        lookup.  If the dispatcher collects statistics, implementations are
+        cached wrapped in a function counting their calls.
+        """
+        self._cache.misses += 1
+        stats = self._stats
+        if stats is None:
+            func = self.dispatch(*types)
+        else:
+            start = perf_counter()
+            func = self.dispatch(*types)
+            stats.dispatch_time += perf_counter() - start
+        if not func:
+            func = missing(self.name, types)
+        elif stats is not None:
+            expanded = self._expanded
+            signature = expanded[types] if types in expanded else self._chain(types)[0]
+            func = counted(stats, signature, func)
+        self._cache[types if key is None else key] = func
+        return func
+
+    def compile(self):
+        """Generate a function specialized to the registered implementations
+
+        The generated function matches the registered signatures by type
+        identity and inlines the cache lookup, avoiding most of the generic
+        work of ``__call__``.  It accepts positional arguments only, and
+        takes exactly as many as the signatures when they all have the same
+        fixed arity.  Later registrations recompile it on its next call.
+
+        >>> f = Dispatcher('f')
+        >>> f.add((int,), lambda x: x + 1)
+        >>> inc = f.compile()
+        >>> inc(1)
+        2
+        >>> f.add((float,), lambda x: x - 1)
+        >>> inc(1.0)
+        0.0
+        """
+        if self._compiled is None:
+            from .codegen import compile_dispatcher
+
+            self._compiled = compile_dispatcher(self)
+        return self._compiled
+
+    def _fallback(self, types, args, kwargs):
+        """Call the next most specific implementations after the one chosen
+        by ``dispatch`` raised ``MDNotImplementedError``
+
+        That is the implementation registered for ``types`` exactly if there
+        is one, which may tie with others at the head of the chain.
+        """
+        if self._stats is not None:
+            self._stats.fallbacks += 1
+        chain = self._chain(types)
+        called = self._expanded.get(types, chain[0] if chain else None)
+        chain = tuple(signature for signature in chain if signature != called)
+        return self._call_chain(chain, types, args, kwargs)
+
+    def call_next(self, signature, *args, **kwargs):
+        """Call the next most specific implementation after ``signature``
+
+        Lets an implementation delegate to the implementations it overrides.
+        ``signature`` is the signature the calling implementation was
+        registered with, and must match the types of ``args``.  Following
+        implementations that raise ``MDNotImplementedError`` are skipped, as
+        when calling the dispatcher.
+
+        >>> f = Dispatcher('f')
+        >>> @f.register(object)
+        ... def describe(x):
+        ...     return 'object'
+        >>> @f.register(int)
+        ... def describe_int(x):
+        ...     return 'int, then ' + f.call_next((int,), x)
+        >>> f(1)
+        'int, then object'
+        """
+        types = tuple([type(arg) for arg in args])
+        return self._call_chain(self._next(signature, types), types, args, kwargs)
+
+    def _chain(self, types):
+        """Signatures matching ``types``, most specific first
+
+        Chains are cached per input types, like resolved implementations,
+        so that fallbacks do not walk the ordering on every call.  Variadic
+        calls with many arguments share their cache keys, see
+        ``variadic_key``.
+        """
+        if len(types) <= self._arity:
+            key = types
+        else:
+            key = variadic_key(types, self._arity)
+        try:
+            return self._chains[key]
+        except KeyError:
+            pass
+        if self._lazy:
+            self._resolve_lazy(types)
+        try:
+            index = self._index
+        except AttributeError:
+            self.reorder()
+            index = self._index
+        expanded = self._expanded
+        chain = tuple(dict.fromkeys(expanded[sig] for sig in index.matches(types)))
+        self._chains[key] = chain
+        return chain
+
+    def _next(self, signature, types):
+        """Signatures of the chain for ``types`` following ``signature``"""
+        signature = signature_key(signature)
+        chain = self._chain(types)
+        try:
+            return chain[chain.index(signature) + 1 :]
+        except ValueError:
+            raise TypeError(
+                "Signature <%s> of %s does not match <%s>"
+                % (str_signature(signature), self.name, str_signature(types))
             )
 
+    def _call_chain(self, chain, types, args, kwargs):
+        funcs = self.funcs
+        sentinel = self._not_implemented
+        for signature in chain:
+            try:
+                result = funcs[signature](*args, **kwargs)
+            except MDNotImplementedError:
+                continue
+            if sentinel is None or result is not sentinel:
+                return result
+
+        raise NotImplementedError(
+            "Matching functions for "
+            "%s: <%s> found, but none completed successfully"
+            % (
+                self.name,
+                str_signature(types),
+            ),
+        )
+
+    def cache_info(self):
+        """Report resolution cache statistics
+
+        >>> f = Dispatcher('f', cache_size=2)
+        >>> f.add((object,), lambda x: x)
+        >>> for x in [1, 2, 'a', 1.0, 3]:
+        ...     _ = f(x)
+        >>> f.cache_info()
+        CacheInfo(hits=1, misses=4, evictions=2, maxsize=2, currsize=2)
+        """
+        return self._cache.info()
+
+    def collect_stats(self, enabled=True):
+        """Start or stop recording runtime statistics, see ``stats``
+
+        Statistics are recorded by wrapping cached implementations, so the
+        cache is cleared when starting or stopping.  Dispatchers that do not
+        collect statistics pay nothing for them.
+        """
+        if enabled == (self._stats is not None):
+            return
+        self._stats = Stats() if enabled else None
+        self._cache.clear()
+        if self._compiled is not None:
+            from .codegen import invalidate
+
+            invalidate(self._compiled)
+
+    def stats(self):
+        """Report runtime statistics as a ``DispatchStats`` named tuple
+
+        Calls of implementations are counted by signature, along with cache
+        hits and misses, calls that fell back to less specific
+        implementations, and the seconds spent resolving implementations on
+        cache misses, including any ordering, and ordering signatures.
+        Returns None unless the dispatcher collects statistics, see
+        ``collect_stats``.
+
+        >>> f = Dispatcher('f', stats=True)
+        >>> f.add((int,), lambda x: x + 1)
+        >>> f.add((float,), lambda x: x - 1)
+        >>> for x in [1, 2, 3.0]:
+        ...     _ = f(x)
+        >>> s = f.stats()
+        >>> s.calls == {(int,): 2, (float,): 1}
+        True
+        >>> s.hits, s.misses, s.fallbacks
+        (1, 2, 0)
+        """
+        if self._stats is None:
+            return None
+        return self._stats.info(self._cache)
+
     def __str__(self):
         return "<dispatched %s>" % self.name
 
@@ -322,25 +971,134 @@ class Dispatcher(object):
         See Also:
           ``multipledispatch.conflict`` - module to determine resolution order
         """
+        if self._lazy:
+            self._resolve_lazy(types)
 
-        if types in self.funcs:
-            return self.funcs[types]
+        if types in self._expanded:
+            return self.funcs[self._expanded[types]]
 
         try:
             return next(self.dispatch_iter(*types))
         except StopIteration:
             return None
 
+    def _resolve_lazy(self, types):
+        """Replace placeholders by the types they name once these are found
+
+        Placeholders are created for dotted type names whose module has not
+        been imported, see ``lazy_type``.  The named type is looked up in
+        ``sys.modules`` and in the MROs of ``types``.  Signatures with newly
+        resolved types are registered again, so the ordering is recomputed.
+        """
+        items = []
+        for signature in list(self._lazy):
+            resolved = resolve_signature(signature, types)
+            if resolved != signature:
+                self._lazy.discard(signature)
+                items.append((resolved, self.funcs.pop(signature)))
+                self._drop_expansions([signature])
+        if items:
+            # explicitly typed registrations take precedence
+            items = [(sig, func) for sig, func in items if sig not in self.funcs]
+            for attr in ("_ordering", "_index"):
+                if hasattr(self, attr):
+                    delattr(self, attr)
+            self._extend(items, ambiguity_warn)
+
+    def map(self, iterable):
+        """Call the dispatcher on each element of ``iterable``
+
+        Equivalent to ``[self(x) for x in iterable]``, but each distinct type
+        is resolved once and the elements are passed to their implementations
+        group by group, see ``starmap``.
+
+        >>> f = Dispatcher('f')
+        >>> f.add((int,), lambda x: x + 1)
+        >>> f.add((float,), lambda x: x - 1)
+        >>> f.map([1, 2.0, 3])
+        [2, 1.0, 4]
+        """
+        return self.starmap((x,) for x in iterable)
+
+    def starmap(self, iterable):
+        """Call the dispatcher on each tuple of arguments in ``iterable``
+
+        Equivalent to ``[self(*args) for args in iterable]``.  Inputs are
+        grouped by implementation, with each distinct tuple of types resolved
+        once, and implementations registered with ``register_batch`` are
+        called once per group.  Results are returned in input order, but
+        implementations are called group by group.
+
+        >>> f = Dispatcher('f')
+        >>> f.add((int, int), lambda x, y: x + y)
+        >>> f.add((str, int), lambda x, y: x * y)
+        >>> f.starmap([(1, 2), ('a', 3)])
+        [3, 'aaa']
+        """
+        items = list(iterable)
+        cache = self._cache
+        resolved = dict()
+        groups = dict()
+        for i, args in enumerate(items):
+            types = tuple(map(type, args))
+            try:
+                func = resolved[types]
+            except KeyError:
+                if self._single and len(types) == 1:
+                    key = types[0]
+                elif len(types) > self._arity:
+                    key = variadic_key(types, self._arity)
+                else:
+                    key = types
+                try:
+                    func = cache[key]
+                    cache.hits += 1
+                except KeyError:
+                    func = self._resolve(types, key)
+                resolved[types] = func
+            groups.setdefault(func, []).append(i)
+
+        results = [None] * len(items)
+        sentinel = self._not_implemented
+        for func, indices in groups.items():
+            batch = getattr(func, "__batch__", None)
+            if batch is not None and items[indices[0]]:
+                columns = [
+                    list(column) for column in zip(*map(items.__getitem__, indices))
+                ]
+                try:
+                    results_group = batch(*columns)
+                except MDNotImplementedError:
+                    results_group = [self._fallback_map(items[i]) for i in indices]
+                for i, result in zip(indices, results_group):
+                    if sentinel is not None and result is sentinel:
+                        # Declined, see ``not_implemented``
+                        result = self._fallback_map(items[i])
+                    results[i] = result
+            else:
+                for i in indices:
+                    try:
+                        result = func(*items[i])
+                    except MDNotImplementedError:
+                        result = self._fallback_map(items[i])
+                    else:
+                        if sentinel is not None and result is sentinel:
+                            result = self._fallback_map(items[i])
+                    results[i] = result
+        return results
+
+    def _fallback_map(self, args):
+        return self._fallback(tuple(map(type, args)), args, {})
+
     def dispatch_iter(self, *types):
-        n = len(types)
-        for signature in self.ordering:
-            if len(signature) == n and all(map(issubclass, types, signature)):
-                result = self.funcs[signature]
-                yield result
-            elif len(signature) and isvariadic(signature[-1]):
-                if variadic_signature_matches(types, signature):
-                    result = self.funcs[signature]
-                    yield result
+        """Implementations matching this type signature, most specific first
+
+        Candidates are looked up in a ``SignatureIndex`` built alongside the
+        ``ordering`` rather than by testing every signature in turn, and the
+        result is cached per types.
+        """
+        for signature in self._chain(types):
+            yield self.funcs[signature]
 
     def resolve(self, types):
         """Deterimine appropriate implementation for this type signature
@@ -353,13 +1111,41 @@ class Dispatcher(object):
         return self.dispatch(*types)
 
     def __getstate__(self):
-        return {"name": self.name, "funcs": self.funcs}
+        return {
+            "name": self.name,
+            "funcs": self.funcs,
+            "expanded": self._expanded,
+            "cache_size": self._cache.maxsize,
+            "weak_cache": isinstance(self._cache, WeakKeys),
+            "not_implemented": self._not_implemented,
+            "stats": self._stats is not None,
+        }
 
     def __setstate__(self, d):
         self.name = d["name"]
         self.funcs = d["funcs"]
-        self._ordering = ordering(self.funcs)
-        self._cache = dict()
+        self._expanded = d.get("expanded")
+        if self._expanded is None:
+            self._expanded = dict(
+                (signature, sig)
+                for sig in self.funcs
+                for signature in expand_signature(sig)
+            )
+        self._ordering = ordering(self._expanded)
+        self._index = SignatureIndex(self._ordering)
+        self._ambiguities = ambiguities(self._expanded)
+        self._cache = make_cache(d.get("cache_size"), d.get("weak_cache", False))
+        self._chains = make_cache(d.get("cache_size"), d.get("weak_cache", False))
+        self._queue = None
+        self._compiled = None
+        self._single = all(len(sig) == 1 for sig in self.funcs)
+        self._arity = variadic_arity(self.funcs)
+        self._lazy = set(sig for sig in self.funcs if haslazy(sig))
+        self._not_implemented = d.get("not_implemented")
+        self._stats = Stats() if d.get("stats") else None
+        self._shared = False
+        if self._not_implemented is not None:
+            self._set_declinable()
 
     @property
     def __doc__(self):
@@ -369,7 +1155,7 @@ class Dispatcher(object):
             docs.append(self.doc)
 
         other = []
-        for sig in self.ordering[::-1]:
+        for sig in dict.fromkeys(self._expanded[sig] for sig in self.ordering[::-1]):
             func = self.funcs[sig]
             if func.__doc__:
                 s = "Inputs: <%s>\n" % str_signature(sig)
@@ -402,7 +1188,36 @@ class Dispatcher(object):
         print(self._source(*args))
 
 
+def batch_implementation(func):
+    """Wrap an implementation taking lists of arguments, see ``register_batch``
+
+    The wrapper calls ``func`` with single element lists and keeps ``func``
+    as its ``__batch__`` attribute for ``Dispatcher.starmap``.
+    """
+
+    @wraps(func)
+    def scalar(*args):
+        (result,) = func(*[[arg] for arg in args])
+        return result
+
+    scalar.__batch__ = func
+    return scalar
+
+
+def missing(name, types):
+    """A function raising ``NotImplementedError`` for calls of ``name`` on
+    ``types``, cached for input types without implementation"""
+    message = "Could not find signature for %s: <%s>" % (name, str_signature(types))
+
+    def raise_not_implemented(*args, **kwargs):
+        raise NotImplementedError(message)
+
+    return raise_not_implemented
+
+
 def source(func):
+    import inspect
+
     s = "File: %s\n\n" % inspect.getsourcefile(func)
     s = s + inspect.getsource(func)
     return s
@@ -415,28 +1230,230 @@ class MethodDispatcher(Dispatcher):
         Dispatcher
     """
 
-    __slots__ = ("obj", "cls")
+    __slots__ = ()
 
     @classmethod
     def get_func_params(cls, func):
-        if hasattr(inspect, "signature"):
-            sig = inspect.signature(func)
-            return itl.islice(sig.parameters.values(), 1, None)
+        from inspect import signature
+
+        return itl.islice(signature(func).parameters.values(), 1, None)
+
+    @classmethod
+    def get_func_param_names(cls, func):
+        names = Dispatcher.get_func_param_names.__func__(cls, func)
+        return None if names is None else names[1:]
+
+    def compile(self):
+        raise TypeError("Methods can not be compiled, see Dispatcher.compile")
+
+    def call_next(self, signature, obj, *args, **kwargs):
+        types = tuple([type(arg) for arg in args])
+        chain = self._next(signature, types)
+        return self._call_chain(chain, types, (obj,) + args, kwargs)
 
     def __get__(self, instance, owner):
-        self.obj = instance
-        self.cls = owner
-        return self
+        if instance is None:
+            return self
+        return BoundMethodDispatcher(self, instance)
+
+    def __call__(self, obj, *args, **kwargs):
+        types = tuple([type(arg) for arg in args])
+        key = types if len(types) <= self._arity else variadic_key(types, self._arity)
+        cache = self._cache
+        try:
+            func = cache[key]
+            cache.hits += 1
+        except KeyError:
+            func = self._resolve(types, key)
+        return func(obj, *args, **kwargs)
+
+
+class BoundMethodDispatcher(object):
+    """A ``MethodDispatcher`` bound to an instance
+
+    Returned by ``MethodDispatcher.__get__``.  Each access creates a new
+    bound object holding the instance, so concurrent calls on different
+    instances never share state, while all of them use the resolution cache
+    of their dispatcher.  Other attributes are looked up on the dispatcher.
+
+    >>> class Foo(object):
+    ...     f = MethodDispatcher('f')
+    ...     @f.register(int)
+    ...     def _(self, x):
+    ...         return x + 1
+    >>> f = Foo().f  # may be kept, e.g. outside of a loop
+    >>> f(1)
+    2
+    """
+
+    __slots__ = "__self__", "__func__"
+
+    def __init__(self, dispatcher, obj):
+        self.__func__ = dispatcher
+        self.__self__ = obj
 
     def __call__(self, *args, **kwargs):
         types = tuple([type(arg) for arg in args])
-        func = self.dispatch(*types)
-        if not func:
-            raise NotImplementedError(
-                "Could not find signature for %s: <%s>"
-                % (self.name, str_signature(types))
-            )
-        return func(self.obj, *args, **kwargs)
+        dispatcher = self.__func__
+        arity = dispatcher._arity
+        key = types if len(types) <= arity else variadic_key(types, arity)
+        cache = dispatcher._cache
+        try:
+            func = cache[key]
+            cache.hits += 1
+        except KeyError:
+            func = dispatcher._resolve(types, key)
+        return func(self.__self__, *args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.__func__, attr)
+
+    @property
+    def __doc__(self):
+        return self.__func__.__doc__
+
+    def __str__(self):
+        return "<bound dispatched %s of %r>" % (self.__func__.name, self.__self__)
+
+    __repr__ = __str__
+
+
+class DeclinableDispatcher(Dispatcher):
+    """A ``Dispatcher`` whose implementations may decline inputs by returning
+    ``not_implemented``
+
+    Dispatchers created with ``not_implemented`` become instances of this
+    class, whose ``__call__`` checks the result of each call for it and
+    falls back to the next most specific implementation.
+
+    >>> f = Dispatcher('f', not_implemented=NotImplemented)
+    >>> isinstance(f, DeclinableDispatcher)
+    True
+
+    See Also:
+        Dispatcher
+    """
+
+    __slots__ = ()
+
+    def __call__(self, *args, **kwargs):
+        cache = self._cache
+        if self._single and len(args) == 1 and not kwargs:
+            (arg,) = args
+            typ = type(arg)
+            try:
+                func = cache[typ]
+                cache.hits += 1
+            except KeyError:
+                func = self._resolve((typ,), typ)
+            try:
+                result = func(arg)
+            except MDNotImplementedError:
+                return self._fallback((typ,), args, kwargs)
+            if result is self._not_implemented:
+                return self._fallback((typ,), args, kwargs)
+            return result
+
+        types = tuple([type(arg) for arg in args])
+        key = types if len(types) <= self._arity else variadic_key(types, self._arity)
+        try:
+            func = cache[key]
+            cache.hits += 1
+        except KeyError:
+            func = self._resolve(types, key)
+        try:
+            result = func(*args, **kwargs)
+        except MDNotImplementedError:
+            return self._fallback(types, args, kwargs)
+        if result is self._not_implemented:
+            return self._fallback(types, args, kwargs)
+        return result
+
+
+class DeclinableMethodDispatcher(MethodDispatcher):
+    """A ``MethodDispatcher`` whose implementations may decline inputs by
+    returning ``not_implemented``, see ``DeclinableDispatcher``"""
+
+    __slots__ = ()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return DeclinableBoundMethodDispatcher(self, instance)
+
+    def __call__(self, obj, *args, **kwargs):
+        types = tuple([type(arg) for arg in args])
+        key = types if len(types) <= self._arity else variadic_key(types, self._arity)
+        cache = self._cache
+        try:
+            func = cache[key]
+            cache.hits += 1
+        except KeyError:
+            func = self._resolve(types, key)
+        result = func(obj, *args, **kwargs)
+        if result is self._not_implemented:
+            return self._fallback(types, (obj,) + args, kwargs)
+        return result
+
+
+class DeclinableBoundMethodDispatcher(BoundMethodDispatcher):
+    """A ``DeclinableMethodDispatcher`` bound to an instance"""
+
+    __slots__ = ()
+
+    def __call__(self, *args, **kwargs):
+        types = tuple([type(arg) for arg in args])
+        dispatcher = self.__func__
+        arity = dispatcher._arity
+        key = types if len(types) <= arity else variadic_key(types, arity)
+        cache = dispatcher._cache
+        try:
+            func = cache[key]
+            cache.hits += 1
+        except KeyError:
+            func = dispatcher._resolve(types, key)
+        obj = self.__self__
+        result = func(obj, *args, **kwargs)
+        if result is dispatcher._not_implemented:
+            return dispatcher._fallback(types, (obj,) + args, kwargs)
+        return result
+
+
+Dispatcher._declinable = DeclinableDispatcher
+MethodDispatcher._declinable = DeclinableMethodDispatcher
+
+
+def expand_signature(signature):
+    """The signatures of single types that a signature with union types
+    expands to, one per combination of their types
+
+    >>> expand_signature((Union[(int, float)], str))
+    [(<class 'int'>, <class 'str'>), (<class 'float'>, <class 'str'>)]
+    >>> expand_signature((int, str))
+    [(<class 'int'>, <class 'str'>)]
+    """
+    return expand_tuples([union_types(typ) for typ in signature])
+
+
+def signature_key(signature):
+    """The signature as registered in ``Dispatcher.funcs``
+
+    Dotted type names are parsed, variadic lists become ``Variadic`` and
+    tuples become ``Union``.
+
+    >>> signature_key((int, [float]))
+    (<class 'int'>, <class 'multipledispatch.variadic.Variadic[float]'>)
+    >>> signature_key(((int, float),))
+    (<class 'multipledispatch.union.Union[(int, float)]'>,)
+    """
+    return tuple(
+        Variadic[typ[0]]
+        if isinstance(typ, list)
+        else Union[typ]
+        if isinstance(typ, tuple)
+        else typ
+        for typ in map(parse, signature)
+    )
 
 
 def str_signature(sig):
@@ -0,0 +1,138 @@
+from .variadic import isvariadic, variadic_matcher, variadic_signature_matches
+
+
+def isabstract(typ):
+    """Can ``issubclass(cls, typ)`` hold without ``typ`` in ``cls.__mro__``?
+
+    True for types whose metaclass customizes ``__subclasscheck__``, such as
+    abstract base classes and variadic signature types.
+
+    >>> from collections.abc import Iterable
+    >>> isabstract(int)
+    False
+    >>> isabstract(Iterable)
+    True
+    """
+    return type(typ).__subclasscheck__ is not type.__subclasscheck__
+
+
+def matches(types, signature):
+    """Do input ``types`` match ``signature``, variadic or not?
+
+    >>> from multipledispatch.variadic import Variadic
+    >>> matches((bool, int), (int, object))
+    True
+    >>> matches((int, int, int), (int, Variadic[int]))
+    True
+    >>> matches((int,), (int, int))
+    False
+    """
+    if signature and isvariadic(signature[-1]):
+        return variadic_signature_matches(types, signature)
+    return len(types) == len(signature) and all(map(issubclass, types, signature))
+
+
+class SignatureIndex(object):
+    """Index of signatures by argument position and type
+
+    Fixed arity signatures are grouped by arity and, for every argument
+    position, by the type expected at that position.  Matching a tuple of
+    input types walks the MRO of each input type and intersects the sets of
+    signatures found at each position, so the cost of a lookup depends on the
+    depth of the input types rather than on the number of signatures.
+
+    Types that may be subclassed virtually (see ``isabstract``) are checked
+    with ``issubclass`` and variadic signatures are checked one by one, each
+    with a matcher built when it is added (see ``variadic_matcher``).
+
+    Matches are returned in the order of the ``ordering`` used to build the
+    index.
+
+    >>> index = SignatureIndex([(int, int), (object, int), (object, object)])
+    >>> index.matches((str, int)) == [(object, int), (object, object)]
+    True
+    >>> index.matches((int,))
+    []
+    """
+
+    __slots__ = "rank", "arities", "exact", "abstract", "variadic"
+
+    def __init__(self, ordering):
+        self.rank = {}
+        self.arities = {}
+        self.exact = {}
+        self.abstract = {}
+        self.variadic = {}
+        for signature in ordering:
+            self.add(signature)
+        self.rerank(ordering)
+
+    def rerank(self, ordering, start=0):
+        """Update match order from ``ordering``, from position ``start`` on"""
+        rank = self.rank
+        for i in range(start, len(ordering)):
+            rank[ordering[i]] = i
+
+    def add(self, signature):
+        """Add a signature to the index
+
+        ``rerank`` must be called with an ordering containing the signature
+        before it may be matched.
+        """
+        signature = tuple(signature)
+        if signature and isvariadic(signature[-1]):
+            self.variadic[signature] = variadic_matcher(signature)
+            return
+
+        n = len(signature)
+        if n not in self.arities:
+            self.arities[n] = set()
+            self.exact[n] = [{} for _ in range(n)]
+            self.abstract[n] = [{} for _ in range(n)]
+        self.arities[n].add(signature)
+        for i, typ in enumerate(signature):
+            table = self.abstract[n][i] if isabstract(typ) else self.exact[n][i]
+            table.setdefault(typ, set()).add(signature)
+
+    def remove(self, signature):
+        """Remove a signature from the index"""
+        signature = tuple(signature)
+        self.rank.pop(signature, None)
+        if signature and isvariadic(signature[-1]):
+            del self.variadic[signature]
+            return
+
+        n = len(signature)
+        self.arities[n].discard(signature)
+        for i, typ in enumerate(signature):
+            table = self.abstract[n][i] if isabstract(typ) else self.exact[n][i]
+            table[typ].discard(signature)
+            if not table[typ]:
+                del table[typ]
+
+    def matches(self, types):
+        """All signatures that accept ``types``, most specific first"""
+        n = len(types)
+        if n not in self.arities:
+            found = set()
+        elif not n:
+            found = set(self.arities[n])
+        else:
+            found = None
+            for typ, exact, abstract in zip(types, self.exact[n], self.abstract[n]):
+                candidates = set()
+                for base in typ.__mro__:
+                    if base in exact:
+                        candidates.update(exact[base])
+                for base, signatures in abstract.items():
+                    if issubclass(typ, base):
+                        candidates.update(signatures)
+                found = candidates if found is None else found & candidates
+                if not found:
+                    break
+
+        for signature, match in self.variadic.items():
+            if match(types):
+                found.add(signature)
+
+        return sorted(found, key=self.rank.__getitem__)
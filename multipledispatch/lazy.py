@@ -0,0 +1,141 @@
+import copyreg
+import sys
+
+from .subtype import volatile
+from .union import Union, isunion
+from .variadic import Variadic, isvariadic
+
+
+def qualified_name(cls):
+    """The dotted name of a class
+
+    >>> qualified_name(int)
+    'builtins.int'
+    """
+    return "%s.%s" % (cls.__module__, cls.__qualname__)
+
+
+@volatile
+class LazyType(type):
+    """Metaclass of placeholders for types named by a dotted string
+
+    A placeholder stands in for a type that may live in a module which has
+    not been imported yet.  A class is a subclass of the placeholder once
+    the named type is found, either in its module in ``sys.modules`` or in
+    the MRO of that class.
+
+    See Also:
+        lazy_type
+    """
+
+    def __subclasscheck__(cls, subclass):
+        if subclass is cls:
+            return True
+        if not isinstance(subclass, type) or islazy(subclass):
+            return False
+        resolved = cls.resolve((subclass,))
+        return resolved is not None and issubclass(subclass, resolved)
+
+    def resolve(cls, types=()):
+        """The type named by this placeholder, or None if it can't be found
+
+        The named module is only looked up in ``sys.modules``, it is never
+        imported.  Otherwise the MROs of ``types`` are searched for a class
+        with the same qualified name.
+        """
+        name = cls.__name__
+        parts = name.split(".")
+        for i in range(len(parts) - 1, 0, -1):
+            obj = sys.modules.get(".".join(parts[:i]))
+            if obj is None:
+                continue
+            for attr in parts[i:]:
+                obj = getattr(obj, attr, None)
+            if isinstance(obj, type):
+                return obj
+        for typ in types:
+            for base in getattr(typ, "__mro__", ()):
+                if qualified_name(base) == name:
+                    return base
+        return None
+
+
+_placeholders = dict()
+
+
+def lazy_type(name):
+    """The type named by a dotted string, or a placeholder for it
+
+    Placeholders are interned, so equal names give the same placeholder.
+
+    >>> lazy_type('collections.OrderedDict')
+    <class 'collections.OrderedDict'>
+    >>> lazy_type('notamodule.Type')
+    <class 'multipledispatch.lazy.notamodule.Type'>
+    >>> lazy_type('notamodule.Type') is lazy_type('notamodule.Type')
+    True
+    """
+    if "." not in name:
+        raise TypeError("Type names must be qualified with their module: %s" % name)
+    try:
+        placeholder = _placeholders[name]
+    except KeyError:
+        placeholder = LazyType(name, (), {"__slots__": ()})
+        _placeholders[name] = placeholder
+    resolved = placeholder.resolve()
+    return placeholder if resolved is None else resolved
+
+
+def islazy(typ):
+    """Is ``typ`` a placeholder created by ``lazy_type``?"""
+    return isinstance(typ, LazyType)
+
+
+def parse(typ):
+    """Replace dotted strings in a signature element by ``lazy_type``
+
+    >>> parse(('builtins.int', float))
+    (<class 'int'>, <class 'float'>)
+    """
+    if isinstance(typ, str):
+        return lazy_type(typ)
+    if isinstance(typ, tuple):
+        return tuple(map(parse, typ))
+    if isinstance(typ, list):
+        return list(map(parse, typ))
+    return typ
+
+
+def haslazy(signature):
+    """Does ``signature`` contain placeholders, including in variadic and
+    union types?"""
+    return any(
+        islazy(typ)
+        or isvariadic(typ)
+        and any(islazy(t) for t in typ.variadic_type)
+        or isunion(typ)
+        and any(islazy(t) for t in typ.union_types)
+        for typ in signature
+    )
+
+
+def resolve_signature(signature, types=()):
+    """Replace the placeholders of ``signature`` that can be resolved
+
+    ``types`` are input types whose MROs may contain the named types.
+    """
+
+    def resolve(typ):
+        if islazy(typ):
+            resolved = typ.resolve(types)
+            return typ if resolved is None else resolved
+        if isvariadic(typ) and haslazy(typ.variadic_type):
+            return Variadic[tuple(map(resolve, typ.variadic_type))]
+        if isunion(typ) and haslazy(typ.union_types):
+            return Union[tuple(map(resolve, typ.union_types))]
+        return typ
+
+    return tuple(map(resolve, signature))
+
+
+copyreg.pickle(LazyType, lambda cls: (lazy_type, (cls.__name__,)))
@@ -0,0 +1,95 @@
+from collections import Counter, namedtuple
+from functools import wraps
+
+DispatchStats = namedtuple(
+    "DispatchStats",
+    ["calls", "hits", "misses", "fallbacks", "dispatch_time", "reorder_time"],
+)
+
+
+class Stats(object):
+    """Runtime statistics recorded by a dispatcher
+
+    ``calls`` counts the calls of each signature's implementation, by
+    signature.  ``fallbacks`` counts calls that fell back to less specific
+    implementations, after one raised ``MDNotImplementedError`` or returned
+    ``not_implemented``.  ``dispatch_time`` and ``reorder_time`` are the
+    seconds spent resolving implementations on cache misses and ordering
+    signatures, respectively.
+
+    See Also:
+        Dispatcher.collect_stats
+    """
+
+    __slots__ = "calls", "fallbacks", "dispatch_time", "reorder_time"
+
+    def __init__(self):
+        self.calls = Counter()
+        self.fallbacks = 0
+        self.dispatch_time = self.reorder_time = 0.0
+
+    def info(self, cache):
+        """Statistics as a ``DispatchStats`` named tuple, with the hits and
+        misses of the resolution ``cache``"""
+        return DispatchStats(
+            dict(self.calls),
+            cache.hits,
+            cache.misses,
+            self.fallbacks,
+            self.dispatch_time,
+            self.reorder_time,
+        )
+
+
+def counted(stats, signature, func):
+    """Wrap the implementation ``func`` of ``signature`` to count its calls
+
+    Dispatchers collecting statistics cache these wrappers in place of their
+    implementations, so that other dispatchers pay nothing per call.
+    Batch implementations, see ``Dispatcher.register_batch``, count each
+    element of their inputs.
+    """
+    calls = stats.calls
+
+    @wraps(func)
+    def call(*args, **kwargs):
+        calls[signature] += 1
+        return func(*args, **kwargs)
+
+    batch = getattr(func, "__batch__", None)
+    if batch is not None:
+
+        def call_batch(*columns):
+            calls[signature] += len(columns[0]) if columns else 1
+            return batch(*columns)
+
+        call.__batch__ = call_batch
+    return call
+
+
+def aggregate(stats):
+    """Sum the statistics of several dispatchers
+
+    ``stats`` maps dispatcher names to their ``DispatchStats``.  Calls are
+    counted by name and signature.
+
+    >>> a = DispatchStats({(int,): 2}, 1, 1, 0, 0.5, 0.25)
+    >>> b = DispatchStats({(str,): 1}, 0, 1, 1, 0.5, 0.0)
+    >>> total = aggregate({'f': a, 'g': b})
+    >>> total.calls == {('f', (int,)): 2, ('g', (str,)): 1}
+    True
+    >>> total.hits, total.misses, total.fallbacks, total.dispatch_time
+    (1, 2, 1, 1.0)
+    """
+    return DispatchStats(
+        dict(
+            ((name, signature), n)
+            for name, s in stats.items()
+            for signature, n in s.calls.items()
+        ),
+        sum(s.hits for s in stats.values()),
+        sum(s.misses for s in stats.values()),
+        sum(s.fallbacks for s in stats.values()),
+        sum(s.dispatch_time for s in stats.values()),
+        sum(s.reorder_time for s in stats.values()),
+    )
@@ -0,0 +1,66 @@
+from abc import get_cache_token
+from weakref import finalize
+
+#: Memoized subclass checks by the ids of both classes
+_table = dict()
+#: Keys of ``_table`` involving each class, by id
+_keys = dict()
+_token = [get_cache_token()]
+#: Metaclasses whose subclass checks may change over time
+_volatile = set()
+
+
+def lookup(a, b):
+    """The memoized result of ``issubclass(a, b)``, or None if unknown
+
+    Subclass checks against variadic signature types and other classes
+    whose metaclass defines ``__subclasscheck__`` in Python are costly, and
+    conflict detection and dispatch repeat them on the same pairs of
+    classes.  Their results are kept in a table shared by all dispatchers,
+    which holds no reference to the classes: their entries are dropped when
+    they are garbage collected.  The table is cleared when
+    ``abc.ABCMeta.register`` adds virtual subclasses.
+    """
+    if _token[0] != get_cache_token():
+        clear()
+    return _table.get((id(a), id(b)))
+
+
+def store(a, b, result):
+    """Memoize ``result`` as the result of ``issubclass(a, b)``
+
+    Nothing is stored if ``b``, or a type that it is a union of, has a
+    metaclass registered with ``volatile``.
+    """
+    members = getattr(b, "variadic_type", None) or getattr(b, "union_types", ())
+    volatile = _volatile.intersection(map(type, members))
+    if type(b) in _volatile or volatile:
+        return result
+    key = (id(a), id(b))
+    _table[key] = result
+    for typ in (a, b):
+        if id(typ) not in _keys:
+            _keys[id(typ)] = set()
+            finalize(typ, _forget, id(typ)).atexit = False
+        _keys[id(typ)].add(key)
+    return result
+
+
+def volatile(metaclass):
+    """Never memoize subclass checks against instances of ``metaclass``"""
+    _volatile.add(metaclass)
+    return metaclass
+
+
+def _forget(ident):
+    """Drop the entries of a garbage collected class"""
+    for key in _keys.pop(ident, ()):
+        _table.pop(key, None)
+
+
+def clear():
+    """Clear the table, for instance after ``abc.ABCMeta.register``"""
+    _table.clear()
+    for keys in _keys.values():
+        keys.clear()
+    _token[0] = get_cache_token()
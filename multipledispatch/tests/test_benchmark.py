@@ -1,4 +1,7 @@
+from functools import singledispatch
+
 from multipledispatch import dispatch
+from multipledispatch.dispatcher import MDNotImplementedError
 import pytest
 
 
@@ -22,11 +25,84 @@ def test_benchmark_call_single_dispatch(benchmark, val):
     benchmark(isint, val)
 
 
+@dispatch(int)
+def isint_single(x):
+    return True
+
+
+@dispatch(object)
+def isint_single(x):
+    return False
+
+
+@singledispatch
+def isint_functools(x):
+    return False
+
+
+@isint_functools.register(int)
+def _(x):
+    return True
+
+
+@pytest.mark.parametrize("val", [1, "a"])
+def test_benchmark_call_single_argument(benchmark, val):
+    benchmark(isint_single, val)
+
+
+@pytest.mark.parametrize("val", [1, "a"])
+def test_benchmark_call_single_argument_functools(benchmark, val):
+    """Reference point for ``test_benchmark_call_single_argument``"""
+    benchmark(isint_functools, val)
+
+
 @pytest.mark.parametrize("val", [(1, 4)])
 def test_benchmark_call_multiple_dispatch(benchmark, val):
     benchmark(isint, *val)
 
 
+@pytest.mark.parametrize("val", [1, "a"])
+def test_benchmark_call_compiled(benchmark, val):
+    benchmark(isint.compile(), val)
+
+
+@dispatch(object)
+def iseven(x):
+    return False
+
+
+@dispatch(int)
+def iseven(x):
+    if x % 2:
+        raise MDNotImplementedError()
+    return True
+
+
+sentinel_namespace = {}
+
+
+@dispatch(object, namespace=sentinel_namespace, not_implemented=NotImplemented)
+def iseven_sentinel(x):
+    return False
+
+
+@dispatch(int, namespace=sentinel_namespace)
+def iseven_sentinel(x):
+    if x % 2:
+        return NotImplemented
+    return True
+
+
+@pytest.mark.parametrize("val", [2, 3])
+def test_benchmark_call_fallback(benchmark, val):
+    benchmark(iseven, val)
+
+
+@pytest.mark.parametrize("val", [2, 3])
+def test_benchmark_call_fallback_sentinel(benchmark, val):
+    benchmark(iseven_sentinel, val)
+
+
 def test_benchmark_add_and_use_instance(benchmark):
     namespace = {}
 
@@ -52,3 +128,27 @@ def test_benchmark_add_and_use_instance(benchmark):
         mul("x", 5)
         mul(1, 2, 3.0, 4.0, 5.0)
         mul(1, 2, 3, 4, 5)
+
+
+class Number(object):
+    @dispatch(int)
+    def isint(self, x):
+        return True
+
+    @dispatch(object)
+    def isint(self, x):
+        return False
+
+
+@pytest.mark.parametrize("val", [1, "a"])
+def test_benchmark_call_method_dispatch(benchmark, val):
+    benchmark(Number().isint, val)
+
+
+def test_benchmark_call_method_dispatch_lookup(benchmark):
+    number = Number()
+
+    @benchmark
+    def inner():
+        number.isint(1)
+        number.isint("a")
@@ -0,0 +1,122 @@
+from multipledispatch.codegen import function_name, generate
+from multipledispatch.dispatcher import (
+    Dispatcher,
+    MDNotImplementedError,
+    MethodDispatcher,
+)
+from multipledispatch.utils import raises
+
+
+class A(object):
+    pass
+
+
+class B(A):
+    pass
+
+
+def test_function_name():
+    assert function_name("add") == "add"
+    assert function_name("type") == "dispatched"
+    assert function_name("lambda") == "dispatched"
+    assert function_name("my func") == "dispatched"
+
+
+def test_compile_fixed_arity():
+    f = Dispatcher("f")
+    f.add((A, A), lambda x, y: "AA")
+    f.add((B, A), lambda x, y: "BA")
+    f.add((object, object), lambda x, y: "oo")
+
+    g = f.compile()
+    assert g.__name__ == "f"
+    assert "def f(a0, a1):" in generate(f, "f")[0]
+    for x in [A(), B(), 1]:
+        for y in [A(), B(), 1]:
+            assert g(x, y) == f(x, y)
+    assert raises(TypeError, lambda: g(1))
+
+
+def test_compile_mixed_arity():
+    f = Dispatcher("f")
+    f.add((), lambda: 0)
+    f.add((int,), lambda x: 1)
+    f.add((int, int), lambda x, y: 2)
+    f.add((str, [int]), lambda *args: len(args))
+
+    g = f.compile()
+    assert g() == 0
+    assert g(1) == 1
+    assert g(1, 2) == 2
+    assert g("a", 1, 2, 3) == 4
+    assert raises(NotImplementedError, lambda: g(1.0))
+
+
+def test_compile_variadic_cache_keys():
+    f = Dispatcher("f")
+    f.add((str, [int]), lambda *args: len(args))
+
+    g = f.compile()
+    for n in range(10):
+        assert g("a", *range(n)) == n + 1
+    assert len(f._cache) == 2
+
+
+def test_compile_fallback():
+    f = Dispatcher("f")
+
+    @f.register(object)
+    def _1(x):
+        return "default"
+
+    @f.register(int)
+    def _2(x):
+        if x % 2 == 0:
+            return "even"
+        raise MDNotImplementedError()
+
+    g = f.compile()
+    assert g(2) == "even"
+    assert g(3) == "default"
+    assert g("a") == "default"
+
+
+def test_compile_not_implemented_sentinel():
+    f = Dispatcher("f", not_implemented=NotImplemented)
+    f.add((object,), lambda x: "default")
+    f.add((int,), lambda x: "even" if x % 2 == 0 else NotImplemented)
+
+    g = f.compile()
+    assert g(2) == "even"
+    assert g(3) == "default"
+    # signatures are still matched by type identity
+    assert "if t0 is " in generate(f, "f")[0]
+
+
+def test_compile_recompiles_on_add():
+    f = Dispatcher("f")
+    f.add((object,), lambda x: "object")
+    g = f.compile()
+    assert g(1) == "object"
+    assert f.compile() is g
+
+    f.add((int,), lambda x: "int")
+    assert g(1) == "int"
+
+    f.add((int, int), lambda x, y: "int, int")
+    assert g(1, 1) == "int, int"
+    assert g(1.0) == "object"
+
+
+def test_compile_override():
+    f = Dispatcher("f")
+    f.add((int,), lambda x: x + 1)
+    g = f.compile()
+
+    with f.override((int,), lambda x: x - 1):
+        assert g(1) == 0
+    assert g(1) == 2
+
+
+def test_compile_method_dispatcher():
+    assert raises(TypeError, lambda: MethodDispatcher("f").compile())
@@ -5,6 +5,9 @@ from multipledispatch.conflict import (
     ambiguous,
     super_signature,
     consistent,
+    insert_signature,
+    update_ambiguities,
+    remove_ambiguities,
 )
 from multipledispatch.dispatcher import Variadic
 
@@ -75,6 +78,68 @@ def test_ordering():
     assert ord[-1] == (A, A) or ord[-1] == (A, C)
 
 
+def test_insert_signature():
+    signatures = [(A, A), (A, B), (B, A), (B, B), (A, C), (C,), (object,)]
+    for i in range(len(signatures)):
+        rest = signatures[:i] + signatures[i + 1 :]
+        od = ordering(rest)
+        insert_signature(od, signatures[i])
+        assert set(od) == set(signatures)
+        for a in od:
+            for b in od:
+                if supercedes(a, b) and not supercedes(b, a):
+                    assert od.index(a) < od.index(b)
+
+
+def test_insert_signature_variadic():
+    od = ordering([(Variadic[A],), (A, Variadic[A])])
+    insert_signature(od, (B, Variadic[B]))
+    assert od.index((B, Variadic[B])) < od.index((A, Variadic[A]))
+    assert od.index((A, Variadic[A])) < od.index((Variadic[A],))
+
+
+def test_update_ambiguities():
+    signatures = [
+        (A, A),
+        (A, B),
+        (B, A),
+        (A, C),
+        (B, B),
+        (C, A),
+        (Variadic[A],),
+        (B, Variadic[A]),
+        (A, Variadic[B]),
+    ]
+    amb = set()
+    for i, signature in enumerate(signatures):
+        new = update_ambiguities(amb, signatures[: i + 1], signature)
+        assert all(signature in pair for pair in new)
+        assert amb == ambiguities(signatures[: i + 1])
+
+
+def test_remove_ambiguities():
+    signatures = [
+        (A, A),
+        (A, B),
+        (B, A),
+        (A, C),
+        (B, B),
+        (C, A),
+        (Variadic[A],),
+        (B, Variadic[A]),
+        (A, Variadic[B]),
+    ]
+    for i in [0, -1, 4]:
+        remaining = list(signatures)
+        amb = ambiguities(remaining)
+        while remaining:
+            signature = remaining.pop(i % len(remaining))
+            new = remove_ambiguities(amb, remaining, signature)
+            assert not any(signature in pair for pair in amb)
+            assert amb == ambiguities(remaining)
+            assert new <= amb
+
+
 def test_type_mro():
     assert super_signature([[object], [type]]) == [type]
 
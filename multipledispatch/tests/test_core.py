@@ -1,6 +1,7 @@
-from multipledispatch import dispatch
+from multipledispatch import batch, dispatch, unregister
+from multipledispatch.core import collect_stats, ismethod, stats
 from multipledispatch.utils import raises
-from functools import partial
+from functools import partial, wraps
 
 test_namespace = dict()
 
@@ -143,7 +144,9 @@ def test_caching_correct_behavior():
 
 
 def test_union_types():
-    @dispatch((A, C))
+    ns = dict()
+
+    @dispatch((A, C), namespace=ns)
     def f(x):
         return 1
 
@@ -216,3 +219,128 @@ def test_methods_multiple_dispatch():
     assert foo.f(A(), A()) == 1
     assert foo.f(A(), C()) == 2
     assert foo.f(C(), C()) == 2
+
+
+def test_ismethod():
+    def f(x, y):
+        pass
+
+    def g(self, x):
+        pass
+
+    def h(x, *, self):
+        pass
+
+    @wraps(g)
+    def wrapper(*args):
+        pass
+
+    assert not ismethod(f)
+    assert ismethod(g)
+    assert ismethod(h)
+    assert ismethod(wrapper)
+    assert not ismethod(partial(g, 1))
+
+    class K(object):
+        def meth(self, x):
+            pass
+
+    assert not ismethod(K().meth)
+
+
+def test_dispatch_does_not_inspect_signatures(monkeypatch):
+    import inspect
+
+    def signature(func):
+        raise AssertionError("inspect.signature called on %s" % func)
+
+    monkeypatch.setattr(inspect, "signature", signature)
+
+    @dispatch(int)
+    def f(x):
+        return x + 1
+
+    @dispatch()
+    def f(x: float):
+        return x - 1
+
+    class Foo(object):
+        @dispatch(int)
+        def g(self, x):
+            return x + 2
+
+    assert f(1) == 2
+    assert f(1.0) == 0.0
+    assert Foo().g(1) == 3
+
+
+def test_batch_namespace():
+    ns = dict()
+
+    @orig_dispatch(int, namespace=ns)
+    def f(x):
+        return "int"
+
+    assert f(1) == "int"
+
+    with batch(ns):
+
+        @orig_dispatch(bool, namespace=ns)
+        def f(x):
+            return "bool"
+
+        @orig_dispatch(int, namespace=ns)
+        def g(x):
+            return "int"
+
+        assert f(True) == "int"
+        assert raises(NotImplementedError, lambda: g(1))
+
+    assert f(True) == "bool"
+    assert g(1) == "int"
+    assert ns["g"].ordering == [(int,)]
+
+
+def test_unregister():
+    ns = dict()
+
+    @orig_dispatch(int, namespace=ns)
+    def f(x):
+        return "int"
+
+    @orig_dispatch(object, namespace=ns)
+    def f(x):
+        return "object"
+
+    assert f(1) == "int"
+    unregister("f", int, namespace=ns)
+    assert f(1) == "object"
+
+    assert unregister("f", namespace=ns) is f
+    assert "f" not in ns
+    assert raises(KeyError, lambda: unregister("f", object, namespace=ns))
+
+
+def test_stats():
+    ns = dict()
+
+    @orig_dispatch(int, namespace=ns)
+    def f(x):
+        return x + 1
+
+    assert stats(ns).calls == {}
+    collect_stats(namespace=ns)
+
+    @orig_dispatch(int, namespace=ns)
+    def g(x):
+        return x + 2
+
+    assert f(1) + f(2) + g(1) == 8
+    s = stats(ns)
+    assert s.calls == {("f", (int,)): 2, ("g", (int,)): 1}
+    assert s.misses == 2
+    assert s.hits == 1
+
+    collect_stats(False, namespace=ns)
+    assert f.stats() is None
+    assert stats(ns).calls == {}
@@ -1,12 +1,15 @@
+import random
 import warnings
 
 from multipledispatch.dispatcher import (
     Dispatcher,
     MDNotImplementedError,
     MethodDispatcher,
+    signature_key,
 )
-from multipledispatch.conflict import ambiguities
-from multipledispatch.utils import raises
+from multipledispatch.conflict import ambiguities, ordering, super_signature
+from multipledispatch.union import union_types
+from multipledispatch.utils import expand_tuples, raises
 
 
 def identity(x):
@@ -21,6 +24,10 @@ def dec(x):
     return x - 1
 
 
+def decline(x):
+    return NotImplemented
+
+
 def test_dispatcher():
     f = Dispatcher("f")
     f.add((int,), inc)
@@ -43,6 +50,183 @@ def test_union_types():
     assert f(1.0) == 2.0
 
 
+def test_union_types_less_specific():
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    class C(object):
+        pass
+
+    f = Dispatcher("f")
+    f.add(((int, float),), lambda x: "union")
+    f.add((int,), lambda x: "int")
+    assert f(True) == f(1) == "int"
+    assert f(1.0) == "union"
+    assert set(f.ordering) == set([(int,), (float,)])
+
+    g = Dispatcher("g")
+    g.add(((A, C),), lambda x: "union")
+    g.add((A,), lambda x: "A")
+    assert g(B()) == g(A()) == "A"
+    assert g(C()) == "union"
+
+
+def test_fallback_from_union():
+    f = Dispatcher("f")
+    f.add((object,), lambda x: "object")
+    f.add(((int, bool),), lambda x: raise_md_not_implemented())
+
+    # the union is called once, though both of its types match bools
+    assert f._chain((bool,)) == (signature_key(((int, bool),)), (object,))
+    assert f(True) == f(1) == "object"
+
+
+def test_union_types_not_expanded():
+    f = Dispatcher("f")
+    number = (int, float, complex, bool)
+    f.add((number,) * 3, lambda x, y, z: x + y + z)
+    f.add((bool, bool, bool), lambda x, y, z: "bools")
+
+    assert len(f.funcs) == 2
+    assert f(1, 2.0, 3j) == 3 + 3j
+    assert f(True, True, True) == "bools"
+    assert f(True, 1, True) == 3
+    assert raises(NotImplementedError, lambda: f(1, 2, "3"))
+
+    f.remove(*(number,) * 3)
+    assert list(f.funcs) == [(bool, bool, bool)]
+    assert f.ordering == [(bool, bool, bool)]
+
+
+def test_union_types_per_type():
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    f = Dispatcher("f")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        f.add(((int, float), (B, str)), lambda x, y: "union")
+        f.add((float, A), lambda x, y: "float")
+        f.add(((int, str), (int, str)), lambda x, y: "union")
+        f.add((object, int), lambda x, y: "object")
+    assert f(1.0, B()) == "union"
+    assert f(1.0, A()) == "float"
+    assert f(1, 1) == "union"
+    assert f(1.0, 1) == "object"
+
+
+def test_union_types_overlapping():
+    f = Dispatcher("f")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        f.add(((int, str),), lambda x: "first")
+        f.add(((int, float),), lambda x: "last")
+        f.reorder()
+    assert f(1) == "last"
+    assert f("a") == "first"
+    assert f(1.0) == "last"
+
+    f.remove((int, float))
+    assert f(1) == "first"
+    assert raises(NotImplementedError, lambda: f(1.0))
+
+
+def test_union_types_ambiguities():
+    f = Dispatcher("f")
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        f.add(((int, str), object), lambda x, y: 1)
+        f.add((object, (int, str)), lambda x, y: 2)
+        f.reorder()
+    assert len(w) == 1
+    assert f._ambiguities == ambiguities(
+        expand_tuples([(int, str), object]) + expand_tuples([object, (int, str)])
+    )
+
+    # the suggested signatures resolve the ambiguities
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for a, b in list(f._ambiguities):
+            f.add(super_signature([a, b]), lambda x, y: 3)
+    assert not f._ambiguities
+    assert f(1, "a") == 3
+
+
+def test_remove_shadowing_union_types():
+    f = Dispatcher("f")
+    f.add(((int, float),), lambda x: "union")
+    f.add((int,), lambda x: "int")
+    assert f(1) == "int"
+
+    f.remove(int)
+    assert f(1) == "union"
+    f.add((int,), lambda x: "int")
+    f.remove((int, float))
+    assert f(1) == "int"
+    assert raises(NotImplementedError, lambda: f(1.0))
+    assert f.ordering == [(int,)]
+
+
+def test_union_types_random():
+    """Unions dispatch as if every combination of their types was
+    registered, as ``expand_tuples`` did before unions were stored"""
+
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    class C(B):
+        pass
+
+    class D(object):
+        pass
+
+    def ignore(dispatcher, ambiguities):
+        pass
+
+    types = [object, A, B, C, D, int, bool]
+    rng = random.Random(2)
+    for _ in range(30):
+        f = Dispatcher("f")
+        f.reorder(ignore)
+        expanded = Dispatcher("expanded")
+        for i in range(rng.randint(1, 8)):
+            signature = []
+            for _ in range(2):
+                members = rng.sample(types, rng.randint(1, 3))
+                members = sorted(members, key=types.index)
+                signature.append(members[0] if len(members) == 1 else tuple(members))
+
+            def func(x, y, i=i):
+                return i
+
+            f.add(signature, func, on_ambiguity=ignore)
+            for sig in expand_tuples(signature):
+                expanded.add(sig, func, on_ambiguity=None)
+            if rng.random() < 0.2:
+                f.remove(*signature, on_ambiguity=ignore)
+                expanded = Dispatcher("expanded")
+                for sig, func in f.funcs.items():
+                    for s in expand_tuples([union_types(t) for t in sig]):
+                        expanded.add(s, func, on_ambiguity=None)
+
+        expanded.reorder(ignore)
+        assert f.ordering == ordering(f._expanded)
+        assert set(f.ordering) == set(expanded.funcs)
+        assert f._ambiguities == ambiguities(expanded.funcs)
+        for x in types:
+            for y in types:
+                assert f.dispatch(x, y) is expanded.dispatch(x, y)
+
+
 def test_dispatcher_as_decorator():
     f = Dispatcher("f")
 
@@ -261,6 +445,149 @@ def test_not_implemented_error():
     assert raises(NotImplementedError, lambda: f(1.0))
 
 
+def test_fallback_chain_cached():
+    f = Dispatcher("f")
+
+    @f.register(object)
+    def _1(x):
+        return "default"
+
+    @f.register(int)
+    def _2(x):
+        raise MDNotImplementedError()
+
+    assert f(1) == "default"
+    assert f._chains[(int,)] == ((int,), (object,))
+    assert f(2) == "default"
+
+    f.add((bool,), lambda x: "bool")
+    assert f(True) == "bool"
+    assert set(f._chains) == set([(int,)])
+
+    f.add((str,), lambda x: "str")
+    assert set(f._chains) == set([(int,)])
+
+    f.add(([object],), lambda *args: "objects")
+    assert not f._chains
+
+
+def test_call_next():
+    f = Dispatcher("f")
+
+    @f.register(object)
+    def _1(x):
+        return ["object"]
+
+    @f.register([float])
+    def _0(*args):
+        return ["any floats"]
+
+    @f.register(int)
+    def _2(x):
+        return ["int"] + f.call_next((int,), x)
+
+    @f.register(bool)
+    def _3(x):
+        return ["bool"] + f.call_next((bool,), x)
+
+    @f.register(float, [float])
+    def _4(x, *rest):
+        return ["floats"] + f.call_next((float, [float]), x, *rest)
+
+    assert f(True) == ["bool", "int", "object"]
+    assert f(1) == ["int", "object"]
+    assert f(1.0, 2.0) == ["floats", "any floats"]
+    assert raises(NotImplementedError, lambda: f.call_next((object,), 1))
+    assert raises(TypeError, lambda: f.call_next((str,), 1))
+
+
+def test_call_next_method():
+    class Foo(object):
+        f = MethodDispatcher("f")
+
+        @f.register(object)
+        def _1(self, x):
+            return "object"
+
+        @f.register(int)
+        def _2(self, x):
+            return "int, then " + Foo.f.call_next((int,), self, x)
+
+    assert Foo().f(1) == "int, then object"
+
+
+def test_not_implemented_sentinel():
+    f = Dispatcher("f", not_implemented=NotImplemented)
+
+    @f.register(object)
+    def _1(x):
+        return "default"
+
+    @f.register(int)
+    def _2(x):
+        return "even" if x % 2 == 0 else NotImplemented
+
+    @f.register(bool)
+    def _3(x):
+        return NotImplemented if x else "false"
+
+    assert f(2) == "even"
+    assert f(3) == "default"
+    assert f(True) == "default"
+    assert f(False) == "false"
+    assert f.dispatch(int) is _2
+    assert f.map([1, 2]) == ["default", "even"]
+
+
+def test_not_implemented_sentinel_batch():
+    f = Dispatcher("f", not_implemented=NotImplemented)
+    f.add((object,), lambda x: "obj")
+
+    @f.register_batch(int)
+    def even(xs):
+        return ["even" if x % 2 == 0 else NotImplemented for x in xs]
+
+    assert f.map([1, 2, 3]) == [f(x) for x in [1, 2, 3]] == ["obj", "even", "obj"]
+
+
+def test_not_implemented_sentinel_unset():
+    f = Dispatcher("f")
+    f.add((object,), lambda x: "default")
+    f.add((int,), lambda x: NotImplemented)
+
+    assert f(1) is NotImplemented
+    assert type(f) is Dispatcher
+
+
+def test_not_implemented_sentinel_variadic():
+    f = Dispatcher("f", not_implemented=NotImplemented)
+    f.add(([object],), lambda *args, **kwargs: "objects")
+    f.add(([int],), lambda *args, **kwargs: "ints" if args[2:] else NotImplemented)
+
+    assert f(1, 2, 3) == "ints"
+    assert f(1, 2) == "objects"
+    assert f(1, 2, x=3) == "objects"
+
+
+def test_not_implemented_sentinel_pickle():
+    import pickle
+
+    f = Dispatcher("f", not_implemented=NotImplemented)
+    f.add((object,), identity)
+    f.add((int,), decline)
+
+    g = pickle.loads(pickle.dumps(f))
+    assert type(g) is type(f)
+    assert g(1) == 1
+
+
+def test_not_implemented_sentinel_subclass():
+    class Sub(Dispatcher):
+        __slots__ = ()
+
+    assert raises(TypeError, lambda: Sub("f", not_implemented=NotImplemented))
+
+
 def test_vararg_not_last_element_of_signature():
     f = Dispatcher("f")
     assert raises(TypeError, lambda: f.register([float], str)(lambda: None))
@@ -419,3 +746,749 @@ def test_vararg_ordering():
     assert f("a", ["a"]) == 2
     assert f(1) == 3
     assert f() == 3
+
+
+def test_vararg_cache_keys():
+    f = Dispatcher("f")
+    f.add((str, [int]), lambda *args: "int")
+    f.add((str, [(int, float)]), lambda *args: "number")
+    f.add((int, int), lambda x, y: "pair")
+
+    for n in range(2, 50):
+        assert f("a", *range(n)) == "int"
+    assert f("a", 1, 2.0, 3) == f("a", 1.0, 2, 2) == "number"
+    assert f(1, 2) == "pair"
+    assert raises(NotImplementedError, lambda: f(1, 2, 3))
+    assert len(f._cache) == 5
+
+    # a longer fixed signature lengthens the keys of variadic calls
+    f.add((str, int, int, int), lambda *args: "four")
+    assert f("a", 1, 2, 3) == "four"
+    assert f("a", 1, 2, 3, 4) == "int"
+
+    # falling back caches chains under the same keys
+    def decline(*args):
+        raise MDNotImplementedError()
+
+    f = Dispatcher("f")
+    f.add(([int],), decline)
+    f.add(([object],), lambda *args: len(args))
+
+    for n in range(1, 200):
+        assert f(*range(n)) == n
+    assert len(f._cache) == 2
+    assert len(f._chains) == 1
+
+
+def test_cache_info():
+    f = Dispatcher("f")
+    f.add((int,), inc)
+    f.add((float,), dec)
+
+    f(1)
+    f(2)
+    f(1.0)
+    info = f.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (1, 2, 0)
+    assert info.maxsize is None
+    assert info.currsize == 2
+
+
+def test_cache_not_implemented():
+    f = Dispatcher("f")
+    f.add((int, int), lambda x, y: x + y)
+
+    for _ in range(3):
+        assert raises(NotImplementedError, lambda: f(1, "a"))
+    assert f.cache_info()[:2] == (2, 1)
+    assert f.dispatch(int, str) is None
+
+    f.add((int, str), lambda x, y: y * x)
+    assert f(2, "a") == "aa"
+
+
+def test_add_invalidates_matching_cache_entries():
+    f = Dispatcher("f")
+    f.add((object, object), lambda x, y: "object")
+
+    for args in [(1, 1), (True, 1), (1, "a"), ("a", "a"), (1.0, True)]:
+        f(*args)
+    assert len(f._cache) == 5
+
+    f.add((int, int), lambda x, y: "int")
+    assert set(f._cache) == set([(int, str), (str, str), (float, bool)])
+    assert f(True, 1) == "int"
+
+    f.add((str, [str]), lambda *args: "str")
+    assert set(f._cache) == set([(int, str), (float, bool), (bool, int)])
+    assert f("a", "a") == "str"
+
+
+def test_add_invalidates_single_argument_cache_entries():
+    f = Dispatcher("f")
+    f.add((object,), identity)
+
+    f(1)
+    f("a")
+    f.add((int,), inc)
+    assert set(f._cache) == set([str])
+    assert f(1) == 2
+
+    f.add((int, int), lambda x, y: x + y)
+    assert not f._cache
+    assert f(1) == 2
+
+
+def test_add_replaces_implementation():
+    f = Dispatcher("f")
+    f.add((object,), identity)
+    f.add((int,), inc)
+    f.add(((float, str),), identity)
+
+    for x in [1, True, 1.0, "a", None]:
+        f(x)
+    od = f.ordering
+
+    f.add((int,), dec)
+    assert f.ordering is od
+    assert f._cache[int] is dec
+    assert f._cache[bool] is dec
+    assert f(True) == 0
+
+    # identity is also registered for other signatures
+    f.add((float,), inc)
+    assert f.ordering is od
+    assert set(f._cache) == set([int, bool, str, type(None)])
+    assert f(1.0) == 2.0
+    assert f("a") == "a"
+
+
+def test_not_implemented_sentinel_method():
+    class Foo(object):
+        f = MethodDispatcher("f", not_implemented=NotImplemented)
+
+        @f.register(object)
+        def _1(self, x):
+            return "object"
+
+        @f.register(int)
+        def _2(self, x):
+            return "int" if x else NotImplemented
+
+    assert Foo().f(1) == "int"
+    assert Foo().f(0) == "object"
+    assert Foo.f(Foo(), 0) == "object"
+
+
+def test_add_replaces_declining_implementation():
+    f = Dispatcher("f", not_implemented=NotImplemented)
+    f.add((object,), lambda x: "object")
+    f.add((int,), lambda x: NotImplemented)
+
+    assert f(1) == "object"
+    f.add((int,), lambda x: "int" if x else NotImplemented)
+    assert f(1) == "int"
+    assert f(0) == "object"
+    assert f.cache_info().misses == 1
+
+
+def test_remove():
+    f = Dispatcher("f")
+    f.add((object, object), lambda x, y: "object")
+    f.add((int, int), lambda x, y: "int")
+    f.add((str, str), lambda x, y: "str")
+
+    for args in [(1, 1), (True, 1), ("a", "a"), (1.0, 1.0)]:
+        f(*args)
+    od = f.ordering
+
+    f.remove(int, int)
+    assert f.ordering is od
+    assert (int, int) not in od
+    assert set(f._cache) == set([(str, str), (float, float)])
+    assert f(1, 1) == "object"
+    assert f("a", "a") == "str"
+    assert f.ordering == ordering(f.funcs)
+    assert raises(KeyError, lambda: f.remove(int, int))
+
+
+def test_remove_reports_ambiguities():
+    f = Dispatcher("f")
+    f.add((float, float), lambda x, y: "float")
+    f.add((object, float), lambda x, y: "object, float")
+    f.add((float, object), lambda x, y: "float, object")
+    f.ordering
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        f.remove(float, float)
+    assert len(w) == 1
+    assert f._ambiguities == ambiguities(f.funcs)
+
+
+def test_remove_union_and_variadic():
+    f = Dispatcher("f")
+    f.add(((int, float),), inc)
+    f.add((int, [int]), lambda *args: sum(args))
+
+    f.remove((int, float))
+    f.remove(int, [int])
+    assert not f.funcs
+
+
+def test_remove_in_batch():
+    f = Dispatcher("f")
+    f.add((int,), inc)
+    with f.batch():
+        f.add((float,), dec)
+        f.remove(float)
+        f.remove(int)
+    assert not f.funcs
+
+
+def test_override():
+    f = Dispatcher("f")
+    f.add((object,), identity)
+    f.add((int,), inc)
+
+    assert f(1) == 2
+    od, cache = f.ordering, f._cache
+
+    with f.override((int,), dec):
+        assert f.ordering is od
+        assert f(1) == 0
+        assert f(True) == 0
+    assert f.ordering is od
+    assert f._cache is cache
+    assert f(1) == 2
+    assert f.cache_info().misses == 1
+
+
+def test_override_new_signature():
+    f = Dispatcher("f")
+    f.add((object,), identity)
+    f.add((int,), inc)
+    od = list(f.ordering)
+    amb = set(f._ambiguities)
+
+    with f.override((bool,), dec):
+        assert f(True) == 0
+        with f.override((float,), inc):
+            f.remove(int)
+            assert f(1.0) == 2.0
+            assert f(1) == 1
+        assert f(1.0) == 1.0
+        assert f(1) == 2
+    assert f.ordering == od
+    assert f._ambiguities == amb
+    assert set(f.funcs) == set([(object,), (int,)])
+    assert f(True) == 2
+
+
+def test_override_restores_on_error():
+    f = Dispatcher("f")
+    f.add((int,), inc)
+
+    def raiser():
+        with f.override((int,), dec):
+            raise ValueError()
+
+    assert raises(ValueError, raiser)
+    assert f(1) == 2
+
+
+def test_cache_size_lru():
+    f = Dispatcher("f", cache_size=2)
+    f.add((object,), identity)
+
+    f(1)
+    f(1.0)
+    f(1)
+    f("a")  # evicts float, the least recently used entry
+    assert set(f._cache) == set([int, str])
+    assert f.cache_info().evictions == 1
+    assert f(1.0) == 1.0
+
+
+def test_cache_disabled():
+    f = Dispatcher("f", cache_size=0)
+    f.add((int,), inc)
+
+    assert f(1) == 2
+    assert f(1) == 2
+    assert f.cache_info() == (0, 2, 0, 0, 0)
+
+
+def test_weak_cache():
+    import gc
+
+    f = Dispatcher("f", weak_cache=True)
+    f.add((object,), identity)
+    f.add((object, object), lambda *args: args)
+
+    def churn():
+        cls = type("Temporary", (object,), {})
+        assert f(1) == 1
+        assert f(cls(), 1)[1] == 1
+        assert isinstance(f(cls()), cls)
+        assert len(f._cache) == 3
+
+    churn()
+    gc.collect()
+    assert set(f._cache) == set([(int,)])
+    assert f.cache_info().hits == 0
+
+    f.add((int,), inc)
+    assert not f._cache
+    assert f(1) == 2
+    assert f(1) == 2
+    assert f.cache_info().hits == 1
+
+
+def test_weak_cache_bounded():
+    f = Dispatcher("f", cache_size=2, weak_cache=True)
+    f.add((object,), identity)
+    classes = [type("Temporary%d" % i, (object,), {}) for i in range(4)]
+
+    for cls in classes:
+        assert isinstance(f(cls()), cls)
+    assert set(f._cache) == set(classes[2:])
+    assert len(f._cache.types) == 2
+    assert f.cache_info().evictions == 2
+
+
+def test_weak_cache_serializable():
+    import gc
+    import pickle
+
+    f = Dispatcher("f", weak_cache=True)
+    f.add((object,), identity)
+
+    g = pickle.loads(pickle.dumps(f))
+    cls = type("Temporary", (object,), {})
+    g(cls())
+    assert len(g._cache) == 1
+    del cls
+    gc.collect()
+    assert not g._cache
+
+
+def test_cache_size_invalid():
+    assert raises(ValueError, lambda: Dispatcher("f", cache_size=-1))
+
+
+def test_cache_size_serializable():
+    import pickle
+
+    f = Dispatcher("f", cache_size=8)
+    f.add((int,), inc)
+
+    g = pickle.loads(pickle.dumps(f))
+    assert g.cache_info().maxsize == 8
+    assert g(1) == 2
+
+
+def test_add_inserts_into_ordering():
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    f = Dispatcher("f")
+    f.add((object,), lambda x: "object")
+    f.add((A,), lambda x: "A")
+    assert f(B()) == "A"
+    od = f.ordering
+
+    f.add((B,), lambda x: "B")
+    assert f.ordering is od
+    assert f.ordering == [(B,), (A,), (object,)]
+    assert f(B()) == "B"
+    assert f(A()) == "A"
+    assert f(1) == "object"
+
+
+def test_add_orders_as_if_registered_at_once():
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    class C(A):
+        pass
+
+    class D(B, C):
+        pass
+
+    signatures = [(A, A), (B, object), (C, A)]
+    f = Dispatcher("f")
+    g = Dispatcher("g")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for signature in signatures:
+            f.add(signature, lambda x, y, s=signature: s)
+            f(D(), A())
+            g.add(signature, lambda x, y, s=signature: s)
+        assert f.ordering == g.ordering == ordering(signatures)
+        assert f(D(), A()) == g(D(), A()) == (C, A)
+
+
+def test_incremental_ordering_random():
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    class C(A):
+        pass
+
+    class D(B, C):
+        pass
+
+    class E(C):
+        pass
+
+    types = [object, A, B, C, D, E, int]
+    rng = random.Random(0)
+    for _ in range(50):
+        f = Dispatcher("f")
+        f.ordering
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for _ in range(20):
+                signature = tuple(rng.choice(types) for _ in range(rng.randint(1, 2)))
+                if signature in f.funcs and rng.random() < 0.5:
+                    f.remove(*signature)
+                else:
+                    f.add(signature, identity)
+                assert f.ordering == ordering(f.funcs)
+
+
+def test_add_reports_ambiguities_once_ordered():
+    ambiguities = []
+
+    def on_ambiguity(dispatcher, amb):
+        ambiguities.append(amb)
+
+    f = Dispatcher("f")
+    f.add((object, object), identity)
+    f.reorder()
+
+    f.add((object, float), identity, on_ambiguity=on_ambiguity)
+    assert not ambiguities
+    f.add((float, object), identity, on_ambiguity=on_ambiguity)
+    assert len(ambiguities) == 1
+    assert set(map(frozenset, ambiguities[0])) == set(
+        [frozenset([(object, float), (float, object)])]
+    )
+
+    # only newly introduced ambiguities are reported
+    f.add((object, int), identity, on_ambiguity=on_ambiguity)
+    assert len(ambiguities) == 2
+    assert set(map(frozenset, ambiguities[1])) == set(
+        [frozenset([(object, int), (float, object)])]
+    )
+
+    # resolved ambiguities are dropped
+    f.add((float, float), identity, on_ambiguity=on_ambiguity)
+    f.add((float, int), identity, on_ambiguity=on_ambiguity)
+    assert len(ambiguities) == 2
+    assert not f._ambiguities
+
+
+def test_batch():
+    ambiguities = []
+
+    def on_ambiguity(dispatcher, amb):
+        ambiguities.append(amb)
+
+    f = Dispatcher("f")
+    f.add((object, object), lambda x, y: 0)
+    assert f(1, 1) == 0
+
+    with f.batch(on_ambiguity=on_ambiguity):
+        f.add((object, int), lambda x, y: 1)
+        f.add((int, object), lambda x, y: 2)
+        f.add((float, float), lambda x, y: 3)
+        # registrations take effect when the block exits
+        assert f(1.0, 1.0) == 0
+        assert not ambiguities
+
+    assert f(1.0, 1.0) == 3
+    assert f(1.0, 1) == 1
+    assert len(ambiguities) == 1
+    assert set(map(frozenset, ambiguities[0])) == set(
+        [frozenset([(object, int), (int, object)])]
+    )
+
+
+def test_batch_orders_new_dispatcher():
+    ambiguities = []
+
+    def on_ambiguity(dispatcher, amb):
+        ambiguities.append(amb)
+
+    f = Dispatcher("f")
+    with f.batch(on_ambiguity=on_ambiguity):
+        f.add((object, int), identity)
+        f.add((int, object), identity)
+
+    assert f.ordering
+    assert len(ambiguities) == 1
+
+
+def test_batch_without_ambiguity_detection():
+    f = Dispatcher("f")
+    with f.batch(on_ambiguity=None):
+        f.add((object, int), lambda x, y: 1)
+        f.add((int, object), lambda x, y: 1)
+
+    assert f(1, 1) == 1
+    assert f._ambiguities is None
+
+
+def test_method_dispatcher_cache():
+    class Test(object):
+        f = MethodDispatcher("f")
+
+        @f.register(int)
+        def _f_int(self, x):
+            return "int"
+
+        @f.register(object)
+        def _f_obj(self, x):
+            return "object"
+
+    t = Test()
+    assert t.f(1) == "int"
+    assert t.f(1) == "int"
+    assert t.f("a") == "object"
+    assert Test.f.cache_info()[:2] == (1, 2)
+
+    @Test.f.register(bool)
+    def _f_bool(self, x):
+        return "bool"
+
+    assert set(Test.f._cache) == set([(int,), (str,)])
+    assert t.f(True) == "bool"
+    assert raises(NotImplementedError, lambda: t.f(1, 2))
+
+
+def test_method_dispatcher_bound_objects():
+    class Test(object):
+        f = MethodDispatcher("f")
+
+        def __init__(self, name):
+            self.name = name
+
+        @f.register(int)
+        def _f_int(self, x):
+            return self.name
+
+    a, b = Test("a"), Test("b")
+    fa, fb = a.f, b.f
+    assert fa is not fb
+    assert fa.__self__ is a and fa.__func__ is Test.f
+    assert fb(1) == "b"
+    assert fa(1) == "a"
+    assert Test.f(b, 1) == "b"
+
+    # attributes of the dispatcher remain reachable
+    assert fa.dispatch(int) is Test.f.funcs[(int,)]
+    assert fa.__doc__ == Test.f.__doc__
+
+
+def test_method_dispatcher_threads():
+    from threading import Thread
+
+    class Test(object):
+        f = MethodDispatcher("f")
+
+        @f.register(int)
+        def _f_int(self, x):
+            return self
+
+    objects = [Test() for _ in range(8)]
+    failures = []
+
+    def work(obj):
+        for i in range(1000):
+            if obj.f(i) is not obj:
+                failures.append(obj)
+
+    threads = [Thread(target=work, args=(obj,)) for obj in objects]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not failures
+
+
+def test_single_argument_fast_path():
+    f = Dispatcher("f")
+    f.add((int,), inc)
+    f.add((float,), dec)
+    assert f._single
+
+    assert f(1) == 2
+    assert f(1.0) == 0.0
+    assert int in f._cache and float in f._cache
+    assert raises(NotImplementedError, lambda: f(1, 2))
+
+    f.add((int, int), lambda x, y: x + y)
+    assert not f._single
+    assert f(1) == 2
+    assert f(1, 2) == 3
+
+
+def test_single_argument_fast_path_kwargs():
+    f = Dispatcher("f")
+
+    @f.register(int)
+    def _(x, y=0):
+        return x + y
+
+    assert f(1) == 1
+    assert f(1, y=2) == 3
+
+
+def test_map():
+    f = Dispatcher("f")
+    f.add((int,), inc)
+    f.add((float,), dec)
+    f.add((object,), identity)
+
+    data = [1, 2.0, "a", 3, 4.0, None]
+    assert f.map(data) == [f(x) for x in data]
+    assert f.map(iter(data)) == [f(x) for x in data]
+    assert f.map([]) == []
+    assert raises(NotImplementedError, lambda: Dispatcher("g").map([1]))
+
+
+def test_starmap():
+    f = Dispatcher("f")
+    f.add((int, int), lambda x, y: x + y)
+    f.add((object, object), lambda x, y: (x, y))
+    f.add((), lambda: "nothing")
+
+    data = [(1, 2), ("a", 1), (), (3, 4)]
+    assert f.starmap(data) == [3, ("a", 1), "nothing", 7]
+
+
+def test_register_batch():
+    calls = []
+    f = Dispatcher("f")
+
+    @f.register_batch(int)
+    def inc_all(xs):
+        calls.append(xs)
+        return [x + 1 for x in xs]
+
+    @f.register(object)
+    def default(x):
+        return x
+
+    assert f.map([1, "a", 2, 3, "b"]) == [2, "a", 3, 4, "b"]
+    assert calls == [[1, 2, 3]]
+    assert f(1) == 2
+    assert f.dispatch(int).__batch__ is inc_all
+
+
+def test_register_batch_multiple_arguments():
+    f = Dispatcher("f")
+
+    @f.register_batch(int, int)
+    def add_all(xs, ys):
+        return [x + y for x, y in zip(xs, ys)]
+
+    assert f.starmap([(1, 2), (3, 4)]) == [3, 7]
+    assert f(1, 2) == 3
+
+
+def test_register_batch_not_implemented():
+    f = Dispatcher("f")
+
+    @f.register(object)
+    def default(x):
+        return "default"
+
+    @f.register_batch(int)
+    def decline(xs):
+        raise MDNotImplementedError()
+
+    assert f.map([1, 2, "a"]) == ["default"] * 3
+
+
+def test_stats():
+    f = Dispatcher("f")
+    f.add((int,), inc)
+    assert f.stats() is None
+
+    f.collect_stats()
+    f.add((object,), lambda x: x)
+    f.add((float,), lambda x: raise_md_not_implemented())
+    assert f(1) == 2
+    assert f(2) == 3
+    assert f("a") == "a"
+    assert f(1.0) == 1.0
+
+    s = f.stats()
+    assert s.calls == {(int,): 2, (object,): 1, (float,): 1}
+    assert s.fallbacks == 1
+    assert s.dispatch_time > 0
+    assert s.reorder_time > 0
+    assert s.hits == f.cache_info().hits
+    assert s.misses == f.cache_info().misses
+
+    # replaced implementations are counted under their signature
+    f.add((int,), dec)
+    assert f(1) == 0
+    assert f.stats().calls[(int,)] == 3
+
+    f.collect_stats(False)
+    assert f.stats() is None
+    assert f(1) == 0
+    assert f.dispatch(int) is dec
+
+
+def raise_md_not_implemented():
+    raise MDNotImplementedError()
+
+
+def test_stats_batch():
+    f = Dispatcher("f", stats=True)
+
+    @f.register_batch(int)
+    def inc_all(xs):
+        return [x + 1 for x in xs]
+
+    assert f.map([1, 2, 3]) == [2, 3, 4]
+    assert f(1) == 2
+    assert f.stats().calls == {(int,): 4}
+
+
+def test_stats_method():
+    class Foo(object):
+        f = MethodDispatcher("f", stats=True)
+
+        @f.register(int)
+        def _(self, x):
+            return x + 1
+
+    foo = Foo()
+    assert foo.f(1) == foo.f(2) - 1
+    assert Foo.f.stats().calls == {(int,): 2}
+
+
+def test_stats_serializable():
+    import pickle
+
+    f = Dispatcher("f", stats=True)
+    f.add((int,), inc)
+
+    g = pickle.loads(pickle.dumps(f))
+    assert g(1) == 2
+    assert g.stats().calls == {(int,): 1}
@@ -2,6 +2,8 @@
 
 # from nose import SkipTest
 
+from functools import wraps
+
 from multipledispatch import dispatch
 from multipledispatch.dispatcher import Dispatcher
 
@@ -68,6 +70,42 @@ def test_method_annotations():
     assert foo.f(1.0) == 0.0
 
 
+def test_partial_annotations():
+    f = Dispatcher("f")
+
+    def inc(x: int, y):
+        return x + y
+
+    assert f.get_func_annotations(inc) is None
+    f.add((), inc)
+    assert set(f.funcs) == set([()])
+
+
+def test_wrapped_annotations():
+    def inc(x: int):
+        return x + 1
+
+    @wraps(inc)
+    def wrapper(*args):
+        return inc(*args)
+
+    f = Dispatcher("f")
+    f.register()(wrapper)
+    assert set(f.funcs) == set([(int,)])
+    assert f(1) == 2
+
+
+def test_bound_method_annotations():
+    class K(object):
+        def meth(self, x: int):
+            return x + 1
+
+    f = Dispatcher("f")
+    f.register()(K().meth)
+    assert set(f.funcs) == set([(int,)])
+    assert f(1) == 2
+
+
 def test_overlaps():
     @dispatch(int)
     def inc(x: int):
@@ -0,0 +1,95 @@
+from collections.abc import Iterable, Sized
+
+from multipledispatch.conflict import ordering
+from multipledispatch.index import SignatureIndex, isabstract, matches
+from multipledispatch.variadic import (
+    Variadic,
+    isvariadic,
+    variadic_signature_matches,
+)
+
+
+class A(object):
+    pass
+
+
+class B(A):
+    pass
+
+
+class C(object):
+    pass
+
+
+class D(B, C):
+    pass
+
+
+def linear_matches(ordered, types):
+    """The reference algorithm: test every signature in turn"""
+    result = []
+    for signature in ordered:
+        if signature and isvariadic(signature[-1]):
+            if variadic_signature_matches(types, signature):
+                result.append(signature)
+        elif len(signature) == len(types) and all(map(issubclass, types, signature)):
+            result.append(signature)
+    return result
+
+
+def test_matches():
+    signatures = [(A, A), (A, B), (A, Variadic[B]), (Variadic[A],), ()]
+    for types in [(), (A,), (B, B), (A, B, B), (C, A)]:
+        for signature in signatures:
+            assert matches(types, signature) == bool(linear_matches([signature], types))
+
+
+def test_isabstract():
+    assert not isabstract(A)
+    assert isabstract(Iterable)
+    assert isabstract(Variadic[A])
+
+
+def test_matches_follow_ordering():
+    ordered = ordering([(A, A), (B, A), (A, B), (B, B), (A, C), (object, object)])
+    index = SignatureIndex(ordered)
+
+    for types in [(A, A), (B, B), (D, D), (B, C), (C, C), (D, C), (C, A)]:
+        assert index.matches(types) == linear_matches(ordered, types)
+
+
+def test_matches_arity():
+    index = SignatureIndex(ordering([(), (A,), (A, A)]))
+    assert index.matches(()) == [()]
+    assert index.matches((B,)) == [(A,)]
+    assert index.matches((B, B, B)) == []
+
+
+def test_matches_abstract():
+    ordered = ordering([(Iterable,), (Sized,), (list,), (object,)])
+    index = SignatureIndex(ordered)
+
+    assert index.matches((list,)) == linear_matches(ordered, (list,))
+    assert index.matches((int,)) == [(object,)]
+
+
+def test_matches_variadic():
+    ordered = ordering([(A, Variadic[B]), (Variadic[A],), (B,), (Variadic[C],)])
+    index = SignatureIndex(ordered)
+
+    for types in [(), (A,), (B,), (A, B, B), (B, A), (C, C), (D, D)]:
+        assert index.matches(types) == linear_matches(ordered, types)
+
+
+def test_remove():
+    signatures = [(A, A), (B, A), (Iterable, A), (Variadic[A],), (object, object)]
+    ordered = ordering(signatures)
+    index = SignatureIndex(ordered)
+
+    for signature in [(B, A), (Iterable, A), (Variadic[A],)]:
+        position = ordered.index(signature)
+        del ordered[position]
+        index.remove(signature)
+        index.rerank(ordered, position)
+        for types in [(A, A), (B, B), (list, A), (A,), (D, D, D)]:
+            assert index.matches(types) == linear_matches(ordered, types)
@@ -0,0 +1,84 @@
+import pickle
+import sys
+import types
+
+from multipledispatch.dispatcher import Dispatcher
+from multipledispatch.lazy import islazy, lazy_type
+from multipledispatch.utils import raises
+from multipledispatch.variadic import Variadic
+
+
+def make_module(name):
+    module = types.ModuleType(name)
+
+    class Thing(object):
+        pass
+
+    class SubThing(Thing):
+        pass
+
+    Thing.__module__ = SubThing.__module__ = name
+    Thing.__qualname__, SubThing.__qualname__ = "Thing", "SubThing"
+    module.Thing = Thing
+    module.SubThing = SubThing
+    return module
+
+
+def test_lazy_type():
+    assert lazy_type("builtins.int") is int
+    placeholder = lazy_type("lazy_test_missing.Thing")
+    assert islazy(placeholder)
+    assert placeholder is lazy_type("lazy_test_missing.Thing")
+    assert not issubclass(int, placeholder)
+    assert issubclass(placeholder, object)
+    assert raises(TypeError, lambda: lazy_type("Thing"))
+
+
+def test_lazy_type_pickle():
+    placeholder = lazy_type("lazy_test_missing.Thing")
+    assert pickle.loads(pickle.dumps(placeholder)) is placeholder
+
+
+def test_resolve_from_sys_modules():
+    name = "lazy_test_sys_modules"
+    f = Dispatcher("f")
+    f.add((name + ".Thing",), lambda x: "thing")
+    f.add((object,), lambda x: "object")
+    assert f(1) == "object"
+    assert f._lazy
+
+    module = make_module(name)
+    sys.modules[name] = module
+    try:
+        assert f(module.SubThing()) == "thing"
+        assert f(1) == "object"
+        assert (module.Thing,) in f.funcs
+        assert not f._lazy
+        assert f.ordering[0] == (module.Thing,)
+    finally:
+        del sys.modules[name]
+
+
+def test_resolve_from_mro():
+    # The module of the class is never imported under this name
+    module = make_module("lazy_test_mro")
+    f = Dispatcher("f")
+    f.add(("lazy_test_mro.Thing",), lambda x: "thing")
+    f.add((object,), lambda x: "object")
+
+    assert f(module.SubThing()) == "thing"
+    assert (module.Thing,) in f.funcs
+
+
+def test_lazy_union_and_variadic():
+    module = make_module("lazy_test_variadic")
+    f = Dispatcher("f")
+    f.add(([("lazy_test_variadic.Thing", int)],), lambda *args: len(args))
+    f.add((("lazy_test_variadic.SubThing", float),), lambda x: "one")
+
+    assert f(1, 2) == 2
+    assert f(1.0) == "one"
+    assert f(module.Thing(), 1) == 2
+    assert (Variadic[(module.Thing, int)],) in f.funcs
+    assert f(module.SubThing()) == "one"
+    assert not f._lazy
@@ -0,0 +1,66 @@
+import gc
+from abc import ABC
+
+from multipledispatch import subtype
+from multipledispatch.lazy import lazy_type
+from multipledispatch.subtype import lookup, store
+from multipledispatch.variadic import Variadic
+
+
+def test_store_lookup():
+    class A(object):
+        pass
+
+    class B(A):
+        pass
+
+    assert lookup(B, A) is None
+    assert store(B, A, True) is True
+    assert store(A, B, False) is False
+    assert lookup(B, A) is True
+    assert lookup(A, B) is False
+
+
+def test_variadic_memoized():
+    class A(object):
+        pass
+
+    variadic = Variadic[A]
+    assert lookup(A, variadic) is None
+    assert issubclass(A, variadic)
+    assert lookup(A, variadic) is True
+    assert not issubclass(int, variadic)
+    assert lookup(int, variadic) is False
+
+
+def test_abc_register_clears():
+    class Base(ABC):
+        pass
+
+    class A(object):
+        pass
+
+    store(A, Base, issubclass(A, Base))
+    assert lookup(A, Base) is False
+    Base.register(A)
+    assert lookup(A, Base) is None
+
+
+def test_collected_classes_forgotten():
+    class A(object):
+        pass
+
+    store(A, object, True)
+    assert lookup(A, object) is True
+    ident = id(A)
+    del A
+    gc.collect()
+    assert ident not in subtype._keys
+    assert not any(ident in key for key in subtype._table)
+
+
+def test_lazy_types_not_memoized():
+    placeholder = lazy_type("subtype_test_missing.Thing")
+    variadic = Variadic[placeholder]
+    assert not issubclass(int, variadic)
+    assert lookup(int, variadic) is None
@@ -0,0 +1,39 @@
+import pickle
+
+from multipledispatch.union import Union, isunion, union_types
+
+
+class A(object):
+    pass
+
+
+class B(A):
+    pass
+
+
+class C(object):
+    pass
+
+
+def test_is_union():
+    assert isunion(Union[(A, C)])
+    assert not isunion(A)
+    assert Union[A] is A
+
+
+def test_interned():
+    assert Union[(A, C)] is Union[(C, A)]
+    assert Union[(A, Union[(B, C)])] is Union[(A, B, C)]
+    assert union_types(Union[(A, A, C)]) == (A, C)
+
+
+def test_subclass():
+    assert issubclass(B, Union[(A, C)])
+    assert not issubclass(int, Union[(A, C)])
+    assert issubclass(Union[(B, C)], Union[(A, C)])
+    assert not issubclass(Union[(A, C)], Union[(B, C)])
+    assert isinstance(B(), Union[(A, C)])
+
+
+def test_pickle():
+    assert pickle.loads(pickle.dumps(Union[(A, C)])) is Union[(A, C)]
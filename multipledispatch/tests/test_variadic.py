@@ -37,3 +37,11 @@ def test_equals_union():
     assert union_a_b_c == union_c_b_a
 
     assert not union_a_b == union_a_b_c
+
+
+def test_interned():
+    assert Variadic[A] is Variadic[A]
+    assert Variadic[(A, B)] is Variadic[(B, A)]
+    assert Variadic[A] is not Variadic[(A, B)]
+    assert hash(Variadic[(A, B)]) == hash(Variadic[(B, A)])
+    assert len({Variadic[A], Variadic[A], Variadic[B]}) == 2
@@ -0,0 +1,113 @@
+import copyreg
+from weakref import WeakValueDictionary
+
+from multipledispatch.subtype import lookup, store
+from multipledispatch.utils import typename
+
+
+class UnionType(type):
+    """Metaclass of union types, see ``Union``"""
+
+    def __subclasscheck__(self, subclass):
+        result = lookup(subclass, self)
+        if result is None:
+            result = all(
+                issubclass(typ, self.union_types) for typ in union_types(subclass)
+            )
+            store(subclass, self, result)
+        return result
+
+    def __instancecheck__(self, instance):
+        return issubclass(type(instance), self)
+
+
+def isunion(obj):
+    """Check whether the type ``obj`` is a union type
+
+    >>> isunion(int)
+    False
+    >>> isunion(Union[(int, float)])
+    True
+    """
+    return isinstance(obj, UnionType)
+
+
+def union_types(typ):
+    """The types of which ``typ`` is a union, or ``typ`` alone
+
+    >>> union_types(Union[(int, float)])
+    (<class 'int'>, <class 'float'>)
+    >>> union_types(int)
+    (<class 'int'>,)
+    """
+    return typ.union_types if isunion(typ) else (typ,)
+
+
+class UnionMeta(type):
+    """A metaclass that overrides ``__getitem__`` on the class, to generate
+    union types.  See the Union class for examples of how this behaves.
+
+    Union types are interned: union types of the same set of types are the
+    same class.
+    """
+
+    def __getitem__(self, types):
+        if not isinstance(types, tuple):
+            types = (types,)
+        # Nested unions are flattened, and duplicates dropped
+        types = tuple(dict.fromkeys(t for typ in types for t in union_types(typ)))
+        if not all(isinstance(typ, type) for typ in types):
+            raise TypeError("Union types must be types: %s" % (types,))
+        if len(types) == 1:
+            return types[0]
+
+        key = frozenset(types)
+        try:
+            return _interned[key]
+        except KeyError:
+            pass
+        typ = UnionType(
+            "Union[%s]" % typename(types),
+            (),
+            dict(union_types=types, __slots__=()),
+        )
+        _interned[key] = typ
+        return typ
+
+
+#: Union types by the set of their types, so that equal union types are the
+#: same class
+_interned = WeakValueDictionary()
+
+
+class Union(metaclass=UnionMeta):
+    """A class whose getitem method generates a type matching any of several
+    types, as registered by tuples in signatures.
+
+    Dispatchers store union types as signature elements, so that a
+    registration is one entry of ``funcs``, while ordering signatures and
+    detecting ambiguities by every combination of their types, see
+    ``multipledispatch.dispatcher.expand_signature``.
+
+    Examples
+    --------
+    >>> Union[(int, float)]
+    <class 'multipledispatch.union.Union[(int, float)]'>
+    >>> issubclass(bool, Union[(int, float)])
+    True
+    >>> issubclass(str, Union[(int, float)])
+    False
+    >>> issubclass(Union[(bool, int)], Union[(int, float)])
+    True
+    >>> Union[(int, float)] is Union[(float, int)]
+    True
+    >>> Union[int]
+    <class 'int'>
+    """
+
+
+def _union(types):
+    return Union[types]
+
+
+copyreg.pickle(UnionType, lambda cls: (_union, (cls.union_types,)))
@@ -1,13 +1,21 @@
+import sys
+from weakref import WeakValueDictionary
+
+from multipledispatch.subtype import lookup, store
 from multipledispatch.utils import typename
 
 
 class VariadicSignatureType(type):
     # checking if subclass is a subclass of self
     def __subclasscheck__(self, subclass):
-        other_type = subclass.variadic_type if isvariadic(subclass) else (subclass,)
-        return subclass is self or all(
-            issubclass(other, self.variadic_type) for other in other_type
-        )
+        result = lookup(subclass, self)
+        if result is None:
+            other_type = subclass.variadic_type if isvariadic(subclass) else (subclass,)
+            result = subclass is self or all(
+                issubclass(other, self.variadic_type) for other in other_type
+            )
+            store(subclass, self, result)
+        return result
 
     def __eq__(self, other):
         """
@@ -23,10 +31,12 @@ class VariadicSignatureType(type):
         bool
             Whether or not `other` is equal to `self`
         """
-        return isvariadic(other) and set(self.variadic_type) == set(other.variadic_type)
+        return self is other or (
+            isvariadic(other) and self.variadic_key == other.variadic_key
+        )
 
     def __hash__(self):
-        return hash((type(self), frozenset(self.variadic_type)))
+        return self.variadic_hash
 
 
 def isvariadic(obj):
@@ -52,10 +62,126 @@ def isvariadic(obj):
     return isinstance(obj, VariadicSignatureType)
 
 
+def variadic_signature_matches_iter(types, full_signature):
+    """Check if a set of input types matches a variadic signature.
+
+    Notes
+    -----
+    The algorithm is as follows:
+
+    Initialize the current signature to the first in the sequence
+
+    For each type in `types`:
+        If the current signature is variadic
+            If the type matches the signature
+                yield True
+            Else
+                Try to get the next signature
+                If no signatures are left we can't possibly have a match
+                    so yield False
+        Else
+            yield True if the type matches the current signature
+            Get the next signature
+    """
+    sigiter = iter(full_signature)
+    sig = next(sigiter)
+    for typ in types:
+        matches = issubclass(typ, sig)
+        yield matches
+        if not isvariadic(sig):
+            # we're not matching a variadic argument, so move to the next
+            # element in the signature
+            sig = next(sigiter)
+    else:
+        try:
+            sig = next(sigiter)
+        except StopIteration:
+            assert isvariadic(sig)
+            yield True
+        else:
+            # We have signature items left over, so all of our arguments
+            # haven't matched
+            yield False
+
+
+def variadic_signature_matches(types, full_signature):
+    # No arguments always matches a variadic signature
+    assert full_signature
+    return variadic_matcher(full_signature)(types)
+
+
+def variadic_matcher(signature):
+    """A function checking whether input types match a variadic signature
+
+    The types of the fixed prefix of the signature are checked position by
+    position, then each distinct trailing type is checked once against the
+    types accepted by the variadic type.  Dispatchers build one matcher per
+    variadic signature when it is registered.
+
+    >>> match = variadic_matcher((str, Variadic[int]))
+    >>> match((str, int, int, bool))
+    True
+    >>> match((str,))
+    True
+    >>> match((int, int))
+    False
+    """
+    prefix, variadic = tuple(signature[:-1]), signature[-1]
+    n = len(prefix)
+    if any(map(isvariadic, prefix)):
+        # Only a trailing variadic type may match any number of arguments
+        return lambda types: False
+    accepted = variadic.variadic_type
+
+    def match(types):
+        return (
+            len(types) >= n
+            and all(map(issubclass, types[:n], prefix))
+            and all(issubclass(typ, accepted) for typ in set(types[n:]))
+        )
+
+    return match
+
+
+def variadic_arity(signatures):
+    """Number of arguments above which only variadic signatures may match
+
+    This is the largest number of types of a fixed signature or of the
+    prefix of a variadic signature.  ``sys.maxsize`` is returned if there is
+    no variadic signature.
+
+    >>> variadic_arity([(int, int), (str, Variadic[int])])
+    2
+    >>> variadic_arity([(int, int)]) == sys.maxsize
+    True
+    """
+    signatures = [tuple(sig) for sig in signatures]
+    if not any(sig and isvariadic(sig[-1]) for sig in signatures):
+        return sys.maxsize
+    return max(len(sig) - bool(sig and isvariadic(sig[-1])) for sig in signatures)
+
+
+def variadic_key(types, arity):
+    """Cache key of input types with more than ``arity`` types
+
+    Only variadic signatures match such inputs, see ``variadic_arity``, and
+    they match the same signatures as the first ``arity`` types followed by
+    each distinct trailing type.  Caching resolutions under these keys keeps
+    one entry per set of trailing types, whatever the number of arguments.
+
+    >>> variadic_key((str, int, int, int), 1)
+    (<class 'str'>, <class 'int'>)
+    """
+    return types[:arity] + tuple(sorted(set(types[arity:]), key=id))
+
+
 class VariadicSignatureMeta(type):
     """A metaclass that overrides ``__getitem__`` on the class. This is used to
     generate a new type for Variadic signatures. See the Variadic class for
     examples of how this behaves.
+
+    Variadic types are interned: variadic types accepting the same set of
+    types are the same class, whose hash is computed once.
     """
 
     def __getitem__(self, variadic_type):
@@ -67,11 +193,28 @@ class VariadicSignatureMeta(type):
 
         if not isinstance(variadic_type, tuple):
             variadic_type = (variadic_type,)
-        return VariadicSignatureType(
+        key = frozenset(variadic_type)
+        try:
+            return _interned[key]
+        except KeyError:
+            pass
+        typ = VariadicSignatureType(
             "Variadic[%s]" % typename(variadic_type),
             (),
-            dict(variadic_type=variadic_type, __slots__=()),
+            dict(
+                variadic_type=variadic_type,
+                variadic_key=key,
+                variadic_hash=hash((VariadicSignatureType, key)),
+                __slots__=(),
+            ),
         )
+        _interned[key] = typ
+        return typ
+
+
+#: Variadic signature types by the set of types they accept, so that equal
+#: variadic types are the same class
+_interned = WeakValueDictionary()
 
 
 class Variadic(metaclass=VariadicSignatureMeta):
@@ -92,4 +235,6 @@ class Variadic(metaclass=VariadicSignatureMeta):
     True
     >>> issubclass(float, Variadic[(int, str)])
     False
+    >>> Variadic[(int, str)] is Variadic[(str, int)]
+    True
     """